@@ -10,17 +10,28 @@ This simulation demonstrates:
 
 The simulation uses the same core components as complete_bacpypes3_simulation_minute.py
 but builds the system structure from a BRICK schema definition.
+
+Requires NumPy, which is installed with the project's `examples` extra.
+
+Set HVACSIM_DATA_LOG to a file path (e.g. sim_data_log.bin) to stream every
+logged series there; by default only the last day of samples is kept in memory.
 """
 
 import asyncio
 import math
+import os
 import random
 import signal
+import struct
+import sys
 import time
 from collections import defaultdict
+from dataclasses import dataclass
 import re
 from typing import List
 
+import numpy as np
+
 try:
     from rdflib import Graph, Namespace, URIRef, Literal
     from rdflib.namespace import RDF, RDFS
@@ -61,9 +72,92 @@ all_devices: List[Application] = []
 virtual_network = None
 controller_app = None
 exit_event = None
-data_log = defaultdict(list)  # For storing simulation data
+data_log = {}  # For storing simulation data (one ring buffer per series)
+data_log_head = defaultdict(int)  # Number of samples written to each series
+data_log_file = None  # Binary file that receives each ring buffer as it fills
 start_time = None
 
+# (hour, minute, "HH:MM") for every minute of the day
+TIME_TABLE = [(m // 60, m % 60, f"{m // 60:02d}:{m % 60:02d}") for m in range(1440)]
+
+# Samples kept per logged series (one simulated day at minute resolution)
+LOG_CAPACITY = 1440
+
+# Where the full history is streamed while only LOG_CAPACITY samples stay in memory
+# (unset: nothing is written to disk)
+DATA_LOG_PATH = os.environ.get("HVACSIM_DATA_LOG")
+
+# Data log record kinds
+LOG_RECORD_FLOAT32 = 0
+LOG_RECORD_TEXT = 1
+
+
+def log(key, value):
+    """Record a sample in the fixed-size ring buffer for a logged series."""
+    buf = data_log.get(key)
+    if buf is None:
+        # Numeric series are stored as float32; anything else (modes, times) as objects
+        dtype = np.float32 if isinstance(value, (int, float)) else object
+        buf = data_log[key] = np.empty(LOG_CAPACITY, dtype=dtype)
+    i = data_log_head[key]
+    buf[i % LOG_CAPACITY] = value
+    data_log_head[key] = i + 1
+
+    # Persist buffers each time they fill, before the next lap overwrites them
+    if (i + 1) % LOG_CAPACITY == 0:
+        write_series(key, buf, LOG_CAPACITY)
+
+
+def write_series(key, buf, count):
+    """
+    Append the first count samples of a series to the data log file.
+
+    Each record is a little-endian (key length: u16, kind: u8, sample count: u32) header
+    and the UTF-8 key. Numeric series (LOG_RECORD_FLOAT32) follow with count float32
+    samples; text series such as times and modes (LOG_RECORD_TEXT) with a u32 byte
+    length and the samples joined by newlines in UTF-8.
+    """
+    if data_log_file is None:
+        return
+    key_bytes = key.encode()
+    if buf.dtype == object:
+        text = "\n".join(map(str, buf[:count])).encode()
+        data_log_file.write(struct.pack("<HBI", len(key_bytes), LOG_RECORD_TEXT, count))
+        data_log_file.write(key_bytes)
+        data_log_file.write(struct.pack("<I", len(text)))
+        data_log_file.write(text)
+    else:
+        data_log_file.write(struct.pack("<HBI", len(key_bytes), LOG_RECORD_FLOAT32, count))
+        data_log_file.write(key_bytes)
+        data_log_file.write(buf[:count].tobytes())
+
+
+def close_data_log():
+    """Write the partially filled ring buffers and close the data log file."""
+    global data_log_file
+
+    if data_log_file is None:
+        return
+    for key, buf in data_log.items():
+        count = data_log_head[key] % LOG_CAPACITY
+        if count:
+            write_series(key, buf, count)
+    data_log_file.close()
+    data_log_file = None
+
+
+# Smallest change that triggers a BACnet update: chiller (load tons, COP, power kW)
+CHILLER_BACNET_EPS = (0.01, 0.01, 0.1)
+# Cooling tower (approach °F, fan speed %, supply temp °F)
+TOWER_BACNET_EPS = (0.01, 0.1, 0.01)
+
+
+def state_changed(state, last_state, eps):
+    """Return True if any value moved by more than its epsilon since the last write."""
+    if last_state is None:
+        return True
+    return any(abs(a - b) > e for a, b, e in zip(state, last_state, eps))
+
 
 class BrickParser:
     """Parser for BRICK schema files to extract building structure."""
@@ -307,9 +401,21 @@ class BrickParser:
         return building_structure
 
 
+@dataclass
+class Weather:
+    """Weather series for one day, one array element per simulation step."""
+
+    temp: np.ndarray
+    humidity: np.ndarray
+    wet_bulb: np.ndarray
+    solar_ghi: np.ndarray
+    wind_speed: np.ndarray
+    wind_direction: np.ndarray
+
+
 def generate_weather_data(season="winter", minute_resolution=True):
     """Generate synthetic weather data for a 24-hour period with minute resolution."""
-    weather_data = {}
+    series = defaultdict(list)
 
     # Adjust temperature range based on season
     if season == "winter":
@@ -363,15 +469,11 @@ def generate_weather_data(season="winter", minute_resolution=True):
             wind_direction = (hour * 15 + random.randint(-5, 5)) % 360
 
             # Create weather data point
-            weather_data[minute] = {
-                "temperature": temp,
-                "humidity": humidity,
-                "solar_ghi": solar_ghi,
-                "wind_speed": wind_speed,
-                "wind_direction": wind_direction,
-                "hour": hour,
-                "minute": minute % 60,
-            }
+            series["temp"].append(temp)
+            series["humidity"].append(humidity)
+            series["solar_ghi"].append(solar_ghi)
+            series["wind_speed"].append(wind_speed)
+            series["wind_direction"].append(wind_direction)
     else:
         # Generate data for each hour (original behavior)
         for hour in range(24):
@@ -399,17 +501,20 @@ def generate_weather_data(season="winter", minute_resolution=True):
             wind_direction = (hour * 15) % 360
 
             # Create weather data point
-            weather_data[hour] = {
-                "temperature": temp,
-                "humidity": humidity,
-                "solar_ghi": solar_ghi,
-                "wind_speed": wind_speed,
-                "wind_direction": wind_direction,
-                "hour": hour,
-                "minute": 0,
-            }
+            series["temp"].append(temp)
+            series["humidity"].append(humidity)
+            series["solar_ghi"].append(solar_ghi)
+            series["wind_speed"].append(wind_speed)
+            series["wind_direction"].append(wind_direction)
 
-    return weather_data
+    arrays = {key: np.array(values, dtype=np.float64) for key, values in series.items()}
+
+    # Wet bulb only depends on temperature and humidity, so compute it once per step here
+    arrays["wet_bulb"] = np.array(
+        [estimate_wet_bulb(t, h) for t, h in zip(series["temp"], series["humidity"])]
+    )
+
+    return Weather(**arrays)
 
 
 def estimate_wet_bulb(dry_bulb, relative_humidity):
@@ -512,16 +617,16 @@ async def simulate_vav_box(vav, app, weather_data, minutes_per_second=1, start_t
     print(f"\nStarting simulation for VAV box {vav.name}...")
     print(f"Speed: {minutes_per_second}x (1 minute per {sleep_time:.1f} seconds)")
 
+    deadline = time.monotonic()
+
     try:
         while not exit_event.is_set():
             # Get current simulation time
             current_minute_of_day = current_minute_of_day % 1440  # Wrap around at end of day
-            hour = current_minute_of_day // 60
-            minute = current_minute_of_day % 60
+            hour, minute, time_str = TIME_TABLE[current_minute_of_day]
 
             # Get weather for current minute
-            weather = weather_data[current_minute_of_day]
-            outdoor_temp = weather["temperature"]
+            outdoor_temp = weather_data.temp[current_minute_of_day]
 
             # Add some random variation to make it more realistic
             outdoor_temp += random.uniform(-0.2, 0.2)  # Small variation
@@ -590,16 +695,15 @@ async def simulate_vav_box(vav, app, weather_data, minutes_per_second=1, start_t
                 await vav.update_bacnet_device()
 
             # Log data for later analysis
-            data_log["time"].append(f"{hour:02d}:{minute:02d}")
-            data_log[f"{vav.name}_temp"].append(vav.zone_temp)
-            data_log[f"{vav.name}_mode"].append(vav.mode)
-            data_log[f"{vav.name}_airflow"].append(vav.current_airflow)
-            data_log["outdoor_temp"].append(outdoor_temp)
+            log("time", time_str)
+            log(f"{vav.name}_temp", vav.zone_temp)
+            log(f"{vav.name}_mode", vav.mode)
+            log(f"{vav.name}_airflow", vav.current_airflow)
+            log("outdoor_temp", outdoor_temp)
 
             # Display current simulation time and key values
             # Only print updates every 5 minutes to reduce console output
             if minute % 5 == 0:
-                time_str = f"{hour:02d}:{minute:02d}"
                 print(
                     f"{vav.name} - Time: {time_str}, Outdoor: {outdoor_temp:.1f}°F, "
                     + f"Zone: {vav.zone_temp:.1f}°F, Mode: {vav.mode}, "
@@ -609,8 +713,10 @@ async def simulate_vav_box(vav, app, weather_data, minutes_per_second=1, start_t
             # Increment time by one minute for the next simulation step
             current_minute_of_day += 1
 
-            # Sleep for the appropriate time to maintain simulation speed
-            await asyncio.sleep(sleep_time)
+            # Sleep until the next tick's deadline so compute time doesn't accumulate as drift
+            # (a late tick still sleeps 0 to yield to the other tasks)
+            deadline += sleep_time
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
 
     except asyncio.CancelledError:
         print(f"\nSimulation for {vav.name} cancelled.")
@@ -630,16 +736,16 @@ async def simulate_ahu(ahu, app, weather_data, vav_boxes, minutes_per_second=1,
 
     print(f"\nStarting simulation for AHU {ahu.name}...")
 
+    deadline = time.monotonic()
+
     try:
         while not exit_event.is_set():
             # Get current simulation time
             current_minute_of_day = current_minute_of_day % 1440  # Wrap around at end of day
-            hour = current_minute_of_day // 60
-            minute = current_minute_of_day % 60
+            _, minute, time_str = TIME_TABLE[current_minute_of_day]
 
             # Get weather for current minute
-            weather = weather_data[current_minute_of_day]
-            outdoor_temp = weather["temperature"]
+            outdoor_temp = weather_data.temp[current_minute_of_day]
 
             # Calculate the current load from VAV boxes
             total_airflow = 0
@@ -711,15 +817,14 @@ async def simulate_ahu(ahu, app, weather_data, vav_boxes, minutes_per_second=1,
                 await ahu.update_bacnet_device()
 
             # Log data
-            data_log[f"{ahu.name}_supply_temp"].append(ahu.current_supply_air_temp)
-            data_log[f"{ahu.name}_airflow"].append(ahu.current_total_airflow)
-            data_log[f"{ahu.name}_cooling"].append(ahu.cooling_valve_position)
-            data_log[f"{ahu.name}_heating"].append(ahu.heating_valve_position)
+            log(f"{ahu.name}_supply_temp", ahu.current_supply_air_temp)
+            log(f"{ahu.name}_airflow", ahu.current_total_airflow)
+            log(f"{ahu.name}_cooling", ahu.cooling_valve_position)
+            log(f"{ahu.name}_heating", ahu.heating_valve_position)
 
             # Display current simulation time and key values
             # Only print updates every 5 minutes to reduce console output
             if minute % 5 == 0:
-                time_str = f"{hour:02d}:{minute:02d}"
                 cooling_status = (
                     f"Cooling: {ahu.cooling_valve_position*100:.0f}%"
                     if ahu.cooling_valve_position > 0
@@ -742,8 +847,10 @@ async def simulate_ahu(ahu, app, weather_data, vav_boxes, minutes_per_second=1,
             # Increment time by one minute for the next simulation step
             current_minute_of_day += 1
 
-            # Sleep for the appropriate time to maintain simulation speed
-            await asyncio.sleep(sleep_time)
+            # Sleep until the next tick's deadline so compute time doesn't accumulate as drift
+            # (a late tick still sleeps 0 to yield to the other tasks)
+            deadline += sleep_time
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
 
     except asyncio.CancelledError:
         print(f"\nSimulation for {ahu.name} cancelled.")
@@ -762,8 +869,15 @@ async def simulate_chilled_water_plant(
     ahus,
     minutes_per_second=1,
     start_time=(6, 0),
+    report_event=None,
+    status=None,
 ):
-    """Simulate a chilled water plant (chiller and cooling tower)."""
+    """
+    Simulate a chilled water plant (chiller and cooling tower).
+
+    Every 5 simulated minutes the latest plant state is copied into status and
+    report_event is set, so plant_reporter can print it outside this loop.
+    """
     current_hour, current_minute = start_time
     current_minute_of_day = current_hour * 60 + current_minute
 
@@ -774,20 +888,66 @@ async def simulate_chilled_water_plant(
         f"\nStarting simulation for chilled water plant ({chiller.name} and {cooling_tower.name})..."
     )
 
+    # The cooling type never changes, so pick the update path once up front
+    if chiller.cooling_type == "water_cooled":
+        # Connect the cooling tower to the chiller
+        chiller.connect_cooling_tower(cooling_tower)
+
+        def update_plant(load, wet_bulb, outdoor_temp):
+            # Update cooling tower with current outdoor conditions
+            cooling_tower.update_load(
+                load=load,
+                entering_water_temp=95,  # Typical return temp from chiller
+                ambient_wet_bulb=wet_bulb,
+                condenser_water_flow=max(100.0, load * 3),  # 3 GPM/ton is typical
+            )
+
+            # Update chiller with current load and conditions
+            chiller.update_load(
+                load=load,
+                entering_chilled_water_temp=54,  # Typical return from building
+                chilled_water_flow=max(100.0, load * 2.4),  # 2.4 GPM/ton is typical
+                ambient_wet_bulb=wet_bulb,
+                ambient_dry_bulb=outdoor_temp,
+            )
+
+        def idle_plant(wet_bulb):
+            chiller.set_idle()
+            cooling_tower.set_idle(ambient_wet_bulb=wet_bulb)
+
+    else:
+
+        def update_plant(load, wet_bulb, outdoor_temp):
+            # Air-cooled chiller doesn't use cooling tower
+            chiller.update_load(
+                load=load,
+                entering_chilled_water_temp=54,  # Typical return from building
+                chilled_water_flow=max(100.0, load * 2.4),
+                ambient_wet_bulb=wet_bulb,
+                ambient_dry_bulb=outdoor_temp,
+            )
+
+        def idle_plant(wet_bulb):
+            # No cooling tower is connected to an air-cooled chiller
+            chiller.set_idle()
+
+    # Last values written to each BACnet device (None until the first write)
+    last_chiller_state = None
+    last_tower_state = None
+
+    deadline = time.monotonic()
+
     try:
         while not exit_event.is_set():
             # Get current simulation time
             current_minute_of_day = current_minute_of_day % 1440  # Wrap around at end of day
-            hour = current_minute_of_day // 60
-            minute = current_minute_of_day % 60
+            _, minute, time_str = TIME_TABLE[current_minute_of_day]
 
             # Get weather for current minute
-            weather = weather_data[current_minute_of_day]
-            outdoor_temp = weather["temperature"]
-            outdoor_humidity = weather["humidity"]
+            outdoor_temp = weather_data.temp[current_minute_of_day]
 
-            # Calculate wet bulb temperature (important for cooling tower performance)
-            wet_bulb = estimate_wet_bulb(outdoor_temp, outdoor_humidity)
+            # Wet bulb temperature (important for cooling tower performance)
+            wet_bulb = weather_data.wet_bulb[current_minute_of_day]
 
             # Calculate total cooling load from AHUs
             total_cooling_load_btuh = 0
@@ -798,90 +958,67 @@ async def simulate_chilled_water_plant(
             # Convert BTU/hr to tons (1 ton = 12,000 BTU/hr)
             total_cooling_load_tons = total_cooling_load_btuh / 12000
 
-            # Update cooling tower based on chiller needs
-            if chiller.cooling_type == "water_cooled":
-                # Connect the cooling tower to the chiller
-                chiller.connect_cooling_tower(cooling_tower)
-
-                # Update cooling tower with current outdoor conditions
-                cooling_tower.update_load(
-                    load=total_cooling_load_tons,
-                    entering_water_temp=95,  # Typical return temp from chiller
-                    ambient_wet_bulb=wet_bulb,
-                    condenser_water_flow=max(
-                        100.0, total_cooling_load_tons * 3
-                    ),  # 3 GPM/ton is typical
-                )
-
-                # Get the condenser water supply temperature from the cooling tower
-                condenser_water_supply_temp = cooling_tower.get_condenser_water_supply_temp()
-
-                # Update chiller with current load and conditions
-                chiller.update_load(
-                    load=total_cooling_load_tons,
-                    entering_chilled_water_temp=54,  # Typical return from building
-                    chilled_water_flow=max(
-                        100.0, total_cooling_load_tons * 2.4
-                    ),  # 2.4 GPM/ton is typical
-                    ambient_wet_bulb=wet_bulb,
-                    ambient_dry_bulb=outdoor_temp,
-                )
+            if total_cooling_load_btuh < 1.0:
+                # No chilled water demand (common in winter): idle the plant instead of
+                # running the full part-load model at zero load
+                idle_plant(wet_bulb)
             else:
-                # Air-cooled chiller doesn't use cooling tower
-                chiller.update_load(
-                    load=total_cooling_load_tons,
-                    entering_chilled_water_temp=54,  # Typical return from building
-                    chilled_water_flow=max(100.0, total_cooling_load_tons * 2.4),
-                    ambient_wet_bulb=wet_bulb,
-                    ambient_dry_bulb=outdoor_temp,
-                )
+                update_plant(total_cooling_load_tons, wet_bulb, outdoor_temp)
 
-            # Update the BACnet devices
-            if app_chiller:
-                await chiller.update_bacnet_device()
-            if app_tower:
-                await cooling_tower.update_bacnet_device()
+            # Read the updated plant state once for BACnet, logging and display
+            chiller_load = chiller.current_load
+            chiller_cop = chiller.current_cop
 
-            # Log data
-            data_log[f"{chiller.name}_load"].append(chiller.current_load)
-            data_log[f"{chiller.name}_cop"].append(chiller.current_cop)
             # Calculate power consumption if attribute doesn't exist
             power = getattr(chiller, "current_power", 0)
             if power == 0 and hasattr(chiller, "calculate_power_consumption"):
                 power = chiller.calculate_power_consumption()
-            data_log[f"{chiller.name}_power"].append(power)
 
             if cooling_tower:
-                data_log[f"{cooling_tower.name}_approach"].append(cooling_tower.current_approach)
-                data_log[f"{cooling_tower.name}_fan_speed"].append(cooling_tower.fan_speed)
+                tower_approach = cooling_tower.current_approach
+                tower_fan_speed = cooling_tower.fan_speed
+                tower_supply_temp = cooling_tower.get_condenser_water_supply_temp()
 
-            # Display current simulation time and key values
-            # Only print updates every 5 minutes to reduce console output
-            if minute % 5 == 0:
-                time_str = f"{hour:02d}:{minute:02d}"
-                # Calculate power consumption if attribute doesn't exist
-                power = getattr(chiller, "current_power", 0)
-                if power == 0 and hasattr(chiller, "calculate_power_consumption"):
-                    power = chiller.calculate_power_consumption()
+            # Update the BACnet devices, skipping writes when nothing meaningful changed
+            if app_chiller:
+                chiller_state = (chiller_load, chiller_cop, power)
+                if state_changed(chiller_state, last_chiller_state, CHILLER_BACNET_EPS):
+                    await chiller.update_bacnet_device()
+                    last_chiller_state = chiller_state
+            if app_tower:
+                tower_state = (tower_approach, tower_fan_speed, tower_supply_temp)
+                if state_changed(tower_state, last_tower_state, TOWER_BACNET_EPS):
+                    await cooling_tower.update_bacnet_device()
+                    last_tower_state = tower_state
 
-                print(
-                    f"Chilled Water Plant - Time: {time_str}, Load: {total_cooling_load_tons:.1f} tons, "
-                    + f"COP: {chiller.current_cop:.2f}, Power: {power:.1f} kW"
-                )
+            # Log data
+            log(f"{chiller.name}_load", chiller_load)
+            log(f"{chiller.name}_cop", chiller_cop)
+            log(f"{chiller.name}_power", power)
 
-                # If we have a cooling tower, show its status
+            if cooling_tower:
+                log(f"{cooling_tower.name}_approach", tower_approach)
+                log(f"{cooling_tower.name}_fan_speed", tower_fan_speed)
+
+            # Hand off key values for display every 5 minutes to reduce console output
+            if report_event is not None and minute % 5 == 0:
+                status["time"] = time_str
+                status["load"] = total_cooling_load_tons
+                status["cop"] = chiller_cop
+                status["power"] = power
                 if cooling_tower:
-                    print(
-                        f"Cooling Tower - Approach: {cooling_tower.current_approach:.1f}°F, "
-                        + f"Fan: {cooling_tower.fan_speed:.0f}%, "
-                        + f"Supply: {cooling_tower.get_condenser_water_supply_temp():.1f}°F"
-                    )
+                    status["tower_approach"] = tower_approach
+                    status["tower_fan_speed"] = tower_fan_speed
+                    status["tower_supply_temp"] = tower_supply_temp
+                report_event.set()
 
             # Increment time by one minute for the next simulation step
             current_minute_of_day += 1
 
-            # Sleep for the appropriate time to maintain simulation speed
-            await asyncio.sleep(sleep_time)
+            # Sleep until the next tick's deadline so compute time doesn't accumulate as drift
+            # (a late tick still sleeps 0 to yield to the other tasks)
+            deadline += sleep_time
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
 
     except asyncio.CancelledError:
         print("\nSimulation for chilled water plant cancelled.")
@@ -889,6 +1026,35 @@ async def simulate_chilled_water_plant(
         print(f"\nError in chilled water plant simulation: {e}")
     finally:
         print("Simulation for chilled water plant stopped.")
+        # An empty status tells the reporter the plant has stopped
+        if report_event is not None:
+            status.clear()
+            report_event.set()
+
+
+async def plant_reporter(report_event, status):
+    """Print the chilled water plant status each time the plant signals a report."""
+    while True:
+        await report_event.wait()
+        report_event.clear()
+
+        if not status:
+            break
+
+        lines = [
+            f"Chilled Water Plant - Time: {status['time']}, Load: {status['load']:.1f} tons, "
+            + f"COP: {status['cop']:.2f}, Power: {status['power']:.1f} kW"
+        ]
+
+        # If we have a cooling tower, show its status
+        if "tower_approach" in status:
+            lines.append(
+                f"Cooling Tower - Approach: {status['tower_approach']:.1f}°F, "
+                + f"Fan: {status['tower_fan_speed']:.0f}%, "
+                + f"Supply: {status['tower_supply_temp']:.1f}°F"
+            )
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 async def shutdown():
@@ -896,27 +1062,29 @@ async def shutdown():
     global exit_event, all_devices
 
     # Signal all tasks to exit
-    if exit_event and not exit_event.is_set():
-        print("\nShutting down...")
+    print("\nShutting down...")
+    if exit_event:
         exit_event.set()
 
     # Close all BACnet devices if using BACpypes
     if all_devices:
-        for app in all_devices:
+        # Detach the list first so nothing is skipped by removing while iterating
+        devices_to_close = list(all_devices)
+        all_devices.clear()
+
+        for app in devices_to_close:
             try:
                 device_name = "unknown"
                 device_id = 0
 
-                # Find the device object
-                for obj in app.objectIdentifier.values():
-                    if hasattr(obj, "objectIdentifier") and obj.objectIdentifier[0] == "device":
-                        device_name = getattr(obj, "objectName", "unknown")
-                        device_id = obj.objectIdentifier[1]
-                        break
+                # The application keeps a reference to its device object
+                device_obj = getattr(app, "device_object", None)
+                if device_obj is not None:
+                    device_name = getattr(device_obj, "objectName", "unknown")
+                    device_id = device_obj.objectIdentifier[1]
 
                 print(f"Cleaning up BACnet device: {device_name} (ID: {device_id})")
                 app.close()
-                all_devices.remove(app)
 
             except Exception as e:
                 print(f"Error during device cleanup: {e}")
@@ -924,7 +1092,7 @@ async def shutdown():
     print("Shutdown complete.")
 
 
-async def create_vav_from_schema(vav_data, device_id_base=1000):
+def create_vav_from_schema(vav_data, device_id_base=1000):
     """Create a VAV box based on BRICK schema data."""
     # Extract room name from the VAV name
     room_id = vav_data.get("feeds", [""])[0]
@@ -958,7 +1126,7 @@ async def create_vav_from_schema(vav_data, device_id_base=1000):
 
 
 async def main():
-    global all_devices, virtual_network, controller_app, exit_event, start_time
+    global all_devices, virtual_network, controller_app, exit_event, start_time, data_log_file
 
     # Record start time
     start_time = time.time()
@@ -966,12 +1134,17 @@ async def main():
     # Create an exit event for clean shutdown
     exit_event = asyncio.Event()
 
-    # Set up signal handlers for graceful shutdown
-    loop = asyncio.get_running_loop()
-    for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, lambda: asyncio.create_task(shutdown()))
-
     try:
+        # Signals only stop the simulation loops; cleanup runs once they have returned
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, exit_event.set)
+
+        if DATA_LOG_PATH:
+            # Stream logged series to disk (64 KiB write buffer) instead of keeping
+            # the full history
+            data_log_file = await asyncio.to_thread(open, DATA_LOG_PATH, "wb", buffering=1 << 16)
+
         # Check if we have rdflib available
         if not RDFLIB_AVAILABLE:
             print("ERROR: rdflib is required to parse BRICK schema files.")
@@ -1038,7 +1211,7 @@ async def main():
         print("\nCreating VAV boxes based on schema:")
         for vav_id, vav_data in building_structure["vavs"].items():
             print(f"Creating VAV box: {vav_id}")
-            vav = await create_vav_from_schema(vav_data, device_id_base)
+            vav = create_vav_from_schema(vav_data, device_id_base)
             vav_boxes.append(vav)
 
             # Add to building
@@ -1067,13 +1240,18 @@ async def main():
         print("\nCreating AHUs based on schema:")
         device_id = 2000
 
+        # Index VAV boxes by name so each AHU can resolve its feeds directly
+        vav_by_name = {vav.name: vav for vav in vav_boxes}
+
         for ahu_id, ahu_data in building_structure["ahus"].items():
             # Determine which VAV boxes are fed by this AHU
             vav_list = []
+            total_max_airflow = 0
             for vav_id in ahu_data["feeds"]:
-                vav = next((v for v in vav_boxes if v.name == vav_id), None)
+                vav = vav_by_name.get(vav_id)
                 if vav:
                     vav_list.append(vav)
+                    total_max_airflow += vav.max_airflow
 
             # Create the AHU with appropriate configuration
             print(f"Creating AHU: {ahu_id} with {len(vav_list)} VAV boxes")
@@ -1084,8 +1262,7 @@ async def main():
                 supply_air_temp_setpoint=55,
                 min_supply_air_temp=52,
                 max_supply_air_temp=65,
-                max_supply_airflow=sum(vav.max_airflow for vav in vav_list)
-                * 1.2,  # 20% safety factor
+                max_supply_airflow=total_max_airflow * 1.2,  # 20% safety factor
                 vav_boxes=vav_list,
                 enable_supply_temp_reset=True,
             )
@@ -1297,6 +1474,9 @@ async def main():
             )
 
         # Start chilled water plant simulation
+        # Plant status is printed by a separate reporter task
+        plant_report_event = asyncio.Event()
+        plant_status = {}
         simulation_tasks.append(
             asyncio.create_task(
                 simulate_chilled_water_plant(
@@ -1308,9 +1488,14 @@ async def main():
                     all_ahus,
                     minutes_per_second=simulation_speed,
                     start_time=start_time_tuple,
+                    report_event=plant_report_event,
+                    status=plant_status,
                 )
             )
         )
+        simulation_tasks.append(
+            asyncio.create_task(plant_reporter(plant_report_event, plant_status))
+        )
 
         # Wait for all tasks to complete or until interrupted
         await asyncio.gather(*simulation_tasks)
@@ -1324,6 +1509,9 @@ async def main():
         # Clean shutdown
         await shutdown()
 
+        # Save any samples not yet streamed to disk
+        close_data_log()
+
 
 if __name__ == "__main__":
     try:
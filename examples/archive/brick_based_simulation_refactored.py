@@ -12,20 +12,30 @@ The simulation demonstrates:
 2. Building a simulation model based on the extracted structure
 3. Creating an HVAC simulation with BACnet integration using BACpypes3
 4. Simulating system behavior with the Building class as the coordinator
+
+Requires NumPy, which is installed with the project's `examples` extra.
 """
 
 import asyncio
-import math
-import random
+import functools
+import hashlib
+import os
+import pickle
+import shutil
 import signal
+import subprocess
+import tempfile
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from collections import defaultdict
+from dataclasses import dataclass
 import re
 from typing import List
 
+import numpy as np
+
 try:
-    from rdflib import Graph, Namespace, URIRef, Literal
+    from rdflib import Graph, Namespace
     from rdflib.namespace import RDF, RDFS
 
     RDFLIB_AVAILABLE = True
@@ -36,18 +46,19 @@ except ImportError:
 try:
     from bacpypes3.vlan import VirtualNetwork
     from bacpypes3.app import Application
-    from bacpypes3.local.device import DeviceObject
-    from bacpypes3.local.networkport import NetworkPortObject
-    from bacpypes3.local.analog import AnalogValueObject
-    from bacpypes3.local.binary import BinaryValueObject
-    from bacpypes3.local.multistate import MultiStateValueObject
-    from bacpypes3.primitivedata import CharacterString, Real
 
     BACPYPES_AVAILABLE = True
 except ImportError:
     print("BACpypes3 not installed. Running in simulation-only mode.")
     BACPYPES_AVAILABLE = False
 
+try:
+    import uvloop  # Optional faster event loop (not available on Windows)
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from src.vav_box import VAVBox
 from src.ahu import AirHandlingUnit
 from src.cooling_tower import CoolingTower
@@ -59,24 +70,87 @@ from src.building import Building
 IP_ADDRESS = "10.88.0.2"
 IP_SUBNET_MASK = "255.255.0.0"
 
+# Run ticks back to back unless HVACSIM_REALTIME=1 asks for pacing at
+# minutes_per_second (see examples/README.md)
+REALTIME = os.environ.get("HVACSIM_REALTIME", "0") == "1"
+
+# Where extracted building structures are cached between runs
+BRICK_CACHE_DIR = ".brick_cache"
+
+# Matches Turtle "@prefix name: <uri> ." and SPARQL-style "PREFIX name: <uri>" lines
+TURTLE_PREFIX_RE = re.compile(r"\s*@?prefix\s+([\w-]*):\s*<([^>]*)>", re.IGNORECASE)
+
+# Point label classification rules as (substring, category, excluded substring),
+# listed in priority order: the first rule whose substring appears in a label
+# (and whose excluded substring does not) decides the label's category
+_VAV_LABEL_RULES = (
+    ("zone air temp", "zone_temp_sensor", "setpoint"),
+    ("setpoint", "temp_setpoint", None),
+    ("damper", "damper_command", None),
+    ("reheat", "reheat_command", None),
+    ("air flow", "airflow_sensor", None),
+)
+_CHILLER_LABEL_RULES = (
+    ("supply temp", "supply_temp_sensor", None),
+    ("return temp", "return_temp_sensor", None),
+)
+
+
+def _compile_label_rules(rules):
+    """Compile label rules into one case-insensitive pattern matched from the label start.
+
+    Each rule becomes a lookahead alternative, tried in rule order, so a label
+    containing several substrings still gets the highest-priority category.
+    """
+    alternatives = []
+    for substring, category, excluded in rules:
+        alternative = f"(?=.*{re.escape(substring)})"
+        if excluded:
+            alternative += f"(?!.*{re.escape(excluded)})"
+        alternatives.append(f"{alternative}(?P<{category}>)")
+    return re.compile("|".join(alternatives), re.IGNORECASE | re.DOTALL)
+
+
+VAV_LABEL_RE = _compile_label_rules(_VAV_LABEL_RULES)
+CHILLER_LABEL_RE = _compile_label_rules(_CHILLER_LABEL_RULES)
+
 # Global references
 all_devices: List[Application] = []
 virtual_network = None
 controller_app = None
 exit_event = None
-data_log = defaultdict(list)  # For storing simulation data
+data_log = {}  # Ring buffers holding the last simulated day, one row per tick
 start_time = None
 
 
+@functools.lru_cache(maxsize=4096)
+def _local_name(node):
+    """Return the part of a URI after the last '#' (or the whole URI if there is none)."""
+    return str(node).rpartition("#")[2]
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_label(pattern, label):
+    """Return the category name that a point label matches in pattern, or None.
+
+    Similar equipment tends to reuse the same point labels, so results are cached.
+    """
+    match = pattern.match(label)
+    return match.lastgroup if match else None
+
+
 class BrickParser:
     """Parser for BRICK schema files to extract building structure."""
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, fast_parse=True):
         """
         Initialize the BRICK parser.
 
         Args:
             file_path: Path to the BRICK TTL file
+            fast_parse: Convert the file to N-Triples with rapper and load that instead of
+                running rdflib's Turtle parser; falls back to the Turtle parser when rapper
+                is not installed or fails
         """
         if not RDFLIB_AVAILABLE:
             raise ImportError("rdflib is required to parse BRICK schema files")
@@ -86,7 +160,8 @@ class BrickParser:
         self.g = self.graph  # Alias for shorter access
 
         # Load the TTL file
-        self.g.parse(file_path, format="turtle")
+        if not (fast_parse and self._load_with_rapper(file_path)):
+            self.g.parse(file_path, format="turtle")
 
         # Define namespaces
         self.BRICK = Namespace("https://brickschema.org/schema/Brick#")
@@ -108,20 +183,82 @@ class BrickParser:
         self.g.bind("ref", self.REF)
         self.g.bind("main", self.main_ns)
 
+        # Index the triples the extractors need once, up front
+        self._build_indexes()
+
+    def _load_with_rapper(self, file_path):
+        """Load the file through rapper's N-Triples output; return False if that isn't possible."""
+        rapper = shutil.which("rapper")
+        if rapper is None:
+            return False
+
+        result = subprocess.run(
+            [rapper, "-q", "-i", "turtle", "-o", "ntriples", file_path],
+            capture_output=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            print(f"rapper could not convert {file_path}, falling back to the Turtle parser")
+            return False
+
+        # N-Triples has a trivial line grammar, so rdflib loads it much faster than Turtle
+        self.g.parse(data=result.stdout.decode("utf-8"), format="nt")
+
+        # N-Triples carries no prefixes; bind the file's own so namespace detection still works
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                match = TURTLE_PREFIX_RE.match(line)
+                if match:
+                    self.g.bind(match.group(1), match.group(2))
+
+        return True
+
+    def _build_indexes(self):
+        """Bucket the graph's triples by type and by (subject, predicate)."""
+        indexed_predicates = (
+            RDF.type,
+            RDFS.label,
+            self.BRICK.feeds,
+            self.BRICK.hasPoint,
+            self.BRICK.isFedBy,
+            self.BRICK.area,
+            self.BRICK.value,
+            self.BRICK.hasPart,
+        )
+
+        self.by_type = defaultdict(list)  # type -> subjects of that type
+        self.by_sp = defaultdict(list)  # (subject, predicate) -> objects
+
+        # Walk one predicate at a time: a full-graph scan comes out of an unordered set,
+        # which would make "first label wins" style lookups vary from run to run
+        for p in indexed_predicates:
+            for s, o in self.g.subject_objects(p):
+                if p == RDF.type:
+                    self.by_type[o].append(s)
+                self.by_sp[(s, p)].append(o)
+
+    def _subjects(self, rdf_type):
+        """Return the subjects declared with the given RDF type."""
+        return self.by_type.get(rdf_type, ())
+
+    def _objects(self, subject, predicate):
+        """Return the objects of (subject, predicate) triples."""
+        return self.by_sp.get((subject, predicate), ())
+
     def extract_building_info(self):
         """Extract basic building information."""
         building_info = {}
 
         # Find building instance
-        for building in self.g.subjects(RDF.type, self.BRICK.Building):
+        for building in self._subjects(self.BRICK.Building):
             # Get building name
-            for name in self.g.objects(building, RDFS.label):
+            for name in self._objects(building, RDFS.label):
                 building_info["name"] = str(name)
                 break
 
             # Get building area
-            for area_node in self.g.objects(building, self.BRICK.area):
-                for value in self.g.objects(area_node, self.BRICK.value):
+            for area_node in self._objects(building, self.BRICK.area):
+                for value in self._objects(area_node, self.BRICK.value):
                     # Extract numeric value from the string
                     match = re.search(r"(\d+)", str(value))
                     if match:
@@ -137,31 +274,31 @@ class BrickParser:
         """Extract AHU information and their relationships."""
         ahu_info = {}
 
-        for ahu in self.g.subjects(RDF.type, self.BRICK.Air_Handler_Unit):
-            ahu_id = str(ahu).split("#")[-1]
+        for ahu in self._subjects(self.BRICK.Air_Handler_Unit):
+            ahu_id = _local_name(ahu)
 
             # Initialize AHU entry
             ahu_info[ahu_id] = {"id": ahu_id, "feeds": [], "points": [], "fed_by": []}
 
             # Get VAV boxes fed by this AHU
-            for vav in self.g.objects(ahu, self.BRICK.feeds):
-                vav_id = str(vav).split("#")[-1]
+            for vav in self._objects(ahu, self.BRICK.feeds):
+                vav_id = _local_name(vav)
                 ahu_info[ahu_id]["feeds"].append(vav_id)
 
             # Get data points related to this AHU
-            for point in self.g.objects(ahu, self.BRICK.hasPoint):
-                point_id = str(point).split("#")[-1]
+            for point in self._objects(ahu, self.BRICK.hasPoint):
+                point_id = _local_name(point)
                 ahu_info[ahu_id]["points"].append(point_id)
 
                 # Get point type
-                for point_type in self.g.objects(point, RDF.type):
+                for point_type in self._objects(point, RDF.type):
                     if "Temperature" in str(point_type):
-                        temp_type = str(point_type).split("#")[-1]
+                        temp_type = _local_name(point_type)
                         ahu_info[ahu_id][temp_type] = point_id
 
             # Get equipment feeding this AHU
-            for source in self.g.objects(ahu, self.BRICK.isFedBy):
-                source_id = str(source).split("#")[-1]
+            for source in self._objects(ahu, self.BRICK.isFedBy):
+                source_id = _local_name(source)
                 ahu_info[ahu_id]["fed_by"].append(source_id)
 
         return ahu_info
@@ -170,31 +307,31 @@ class BrickParser:
         """Extract VAV box information and their relationships."""
         vav_info = {}
 
-        for vav in self.g.subjects(RDF.type, self.BRICK.VAV):
-            vav_id = str(vav).split("#")[-1]
+        for vav in self._subjects(self.BRICK.VAV):
+            vav_id = _local_name(vav)
 
             # Initialize VAV entry
             vav_info[vav_id] = {"id": vav_id, "feeds": [], "points": [], "has_reheat": False}
 
             # Get zones fed by this VAV
-            for zone in self.g.objects(vav, self.BRICK.feeds):
-                zone_id = str(zone).split("#")[-1]
+            for zone in self._objects(vav, self.BRICK.feeds):
+                zone_id = _local_name(zone)
                 vav_info[vav_id]["feeds"].append(zone_id)
 
             # Get data points related to this VAV
-            for point in self.g.objects(vav, self.BRICK.hasPoint):
-                point_id = str(point).split("#")[-1]
+            for point in self._objects(vav, self.BRICK.hasPoint):
+                point_id = _local_name(point)
                 point_label = None
 
                 # Try to get point label
-                for label in self.g.objects(point, RDFS.label):
+                for label in self._objects(point, RDFS.label):
                     point_label = str(label)
                     break
 
                 # Get point type
                 point_info = {"id": point_id, "label": point_label, "types": []}
-                for point_type in self.g.objects(point, RDF.type):
-                    type_name = str(point_type).split("#")[-1]
+                for point_type in self._objects(point, RDF.type):
+                    type_name = _local_name(point_type)
                     point_info["types"].append(type_name)
 
                     # Check for reheat
@@ -204,40 +341,27 @@ class BrickParser:
                 vav_info[vav_id]["points"].append(point_info)
 
                 # Categorize specific point types for easier access
-                if point_label:
-                    lower_label = point_label.lower()
-
-                    if "zone air temp" in lower_label and "setpoint" not in lower_label:
-                        vav_info[vav_id]["zone_temp_sensor"] = point_id
-
-                    elif "setpoint" in lower_label:
-                        vav_info[vav_id]["temp_setpoint"] = point_id
-
-                    elif "damper" in lower_label:
-                        vav_info[vav_id]["damper_command"] = point_id
-
-                    elif "reheat" in lower_label:
-                        vav_info[vav_id]["reheat_command"] = point_id
+                category = _classify_label(VAV_LABEL_RE, point_label) if point_label else None
+                if category:
+                    vav_info[vav_id][category] = point_id
+                    if category == "reheat_command":
                         vav_info[vav_id]["has_reheat"] = True
 
-                    elif "air flow" in lower_label:
-                        vav_info[vav_id]["airflow_sensor"] = point_id
-
         return vav_info
 
     def extract_zone_info(self):
         """Extract zone information and their relationships."""
         zone_info = {}
 
-        for zone in self.g.subjects(RDF.type, self.BRICK.HVAC_Zone):
-            zone_id = str(zone).split("#")[-1]
+        for zone in self._subjects(self.BRICK.HVAC_Zone):
+            zone_id = _local_name(zone)
 
             # Initialize zone entry
             zone_info[zone_id] = {"id": zone_id, "rooms": []}
 
             # Get rooms in this zone
-            for room in self.g.objects(zone, self.BRICK.hasPart):
-                room_id = str(room).split("#")[-1]
+            for room in self._objects(zone, self.BRICK.hasPart):
+                room_id = _local_name(room)
                 zone_info[zone_id]["rooms"].append(room_id)
 
         return zone_info
@@ -246,40 +370,35 @@ class BrickParser:
         """Extract chiller information and their relationships."""
         chiller_info = {}
 
-        for chiller in self.g.subjects(RDF.type, self.BRICK.Chiller):
-            chiller_id = str(chiller).split("#")[-1]
+        for chiller in self._subjects(self.BRICK.Chiller):
+            chiller_id = _local_name(chiller)
 
             # Initialize chiller entry
             chiller_info[chiller_id] = {"id": chiller_id, "points": []}
 
             # Get data points related to this chiller
-            for point in self.g.objects(chiller, self.BRICK.hasPoint):
-                point_id = str(point).split("#")[-1]
+            for point in self._objects(chiller, self.BRICK.hasPoint):
+                point_id = _local_name(point)
                 point_label = None
 
                 # Try to get point label
-                for label in self.g.objects(point, RDFS.label):
+                for label in self._objects(point, RDFS.label):
                     point_label = str(label)
                     break
 
                 point_info = {"id": point_id, "label": point_label, "types": []}
 
                 # Get point type
-                for point_type in self.g.objects(point, RDF.type):
-                    type_name = str(point_type).split("#")[-1]
+                for point_type in self._objects(point, RDF.type):
+                    type_name = _local_name(point_type)
                     point_info["types"].append(type_name)
 
                 chiller_info[chiller_id]["points"].append(point_info)
 
                 # Categorize specific point types for easier access
-                if point_label:
-                    lower_label = point_label.lower()
-
-                    if "supply temp" in lower_label:
-                        chiller_info[chiller_id]["supply_temp_sensor"] = point_id
-
-                    elif "return temp" in lower_label:
-                        chiller_info[chiller_id]["return_temp_sensor"] = point_id
+                category = _classify_label(CHILLER_LABEL_RE, point_label) if point_label else None
+                if category:
+                    chiller_info[chiller_id][category] = point_id
 
         return chiller_info
 
@@ -303,10 +422,66 @@ class BrickParser:
         return building_structure
 
 
+def load_building_structure(file_path, cache_dir=BRICK_CACHE_DIR):
+    """Return BrickParser(file_path).extract_all_equipment(), cached on disk.
+
+    The cache entry is keyed by the file's path, modification time and size and
+    by a hash of this script's source, so editing either the schema or the
+    extraction code invalidates it. A missing or unreadable entry falls back to
+    parsing the file.
+    """
+    with open(__file__, "rb") as f:
+        source_hash = hashlib.sha1(f.read()).hexdigest()
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}:{stat.st_mtime_ns}:{stat.st_size}:{source_hash}"
+    cache_path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pkl")
+
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Ignoring unreadable BRICK cache {cache_path}: {e}")
+
+    building_structure = BrickParser(file_path).extract_all_equipment()
+
+    # Write to a temporary file and rename it into place so an interrupted run
+    # never leaves a truncated cache entry behind
+    temp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=cache_dir, delete=False) as f:
+            temp_path = f.name
+            pickle.dump(building_structure, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        # The cache is only an optimization: report the failure and carry on uncached
+        print(f"Could not write BRICK cache {cache_path}: {e}")
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return building_structure
+
+
+@dataclass
+class WeatherSeries:
+    """Weather series for one day, one array element per simulation step."""
+
+    time: np.ndarray
+    temperature: np.ndarray
+    humidity: np.ndarray
+    wet_bulb: np.ndarray
+    solar_ghi: np.ndarray
+    wind_speed: np.ndarray
+    wind_direction: np.ndarray
+
+    def __len__(self):
+        return len(self.time)
+
+
 def generate_weather_data(season="winter", minute_resolution=True):
     """Generate synthetic weather data for a 24-hour period with minute resolution."""
-    weather_data = []
-
     # Adjust temperature range based on season
     if season == "winter":
         temp_min, temp_max = 30, 55  # Cold winter day
@@ -324,110 +499,79 @@ def generate_weather_data(season="winter", minute_resolution=True):
     # Base time for simulation
     base_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
+    # Peak solar radiation for the season
+    if season == "summer":
+        max_solar = 800  # Summer solar radiation peak
+    elif season == "winter":
+        max_solar = 500  # Winter solar radiation peak
+    else:
+        max_solar = 650  # Spring/fall
+
     if minute_resolution:
-        # Generate data for each minute of the day (1440 minutes)
-        for minute in range(1440):
-            hour = minute // 60
-            hour_fraction = minute / 60
-
-            # Calculate hour in radians for sinusoidal pattern (lowest at 5am, highest at 3pm)
-            hour_rad = math.pi * (hour_fraction - 5) / 12
-
-            # Outdoor temperature model
-            temp = temp_min + temp_range * math.sin(hour_rad) ** 2
-
-            # Add small random fluctuations for more realistic data
-            temp += random.uniform(-0.2, 0.2)
-
-            # Humidity model (highest at night/morning, lowest in afternoon)
-            humidity = 70 - 30 * math.sin(hour_rad) ** 2
-            humidity += random.uniform(-1, 1)  # Small random fluctuations
-
-            # Solar radiation (0 at night, peak at noon)
-            if 7 <= hour <= 17:  # Daylight hours
-                solar_factor = math.sin(math.pi * (hour_fraction - 7) / 10)
-                if season == "summer":
-                    max_solar = 800  # Summer solar radiation peak
-                elif season == "winter":
-                    max_solar = 500  # Winter solar radiation peak
-                else:
-                    max_solar = 650  # Spring/fall
-                solar_ghi = max_solar * solar_factor
-            else:
-                solar_ghi = 0
-
-            # Wind speed and direction with small variations
-            wind_speed = 5 + 5 * math.sin(hour_fraction / 12 * math.pi)
-            wind_speed += random.uniform(-0.5, 0.5)  # Add small variations
-            wind_direction = (hour * 15 + random.randint(-5, 5)) % 360
-
-            # Create weather data point with timestamp
-            current_time = base_time + timedelta(minutes=minute)
-            weather_data.append(
-                {
-                    "time": current_time,
-                    "temperature": temp,
-                    "humidity": humidity,
-                    "solar_ghi": solar_ghi,
-                    "wind_speed": wind_speed,
-                    "wind_direction": wind_direction,
-                }
-            )
+        # One sample for each minute of the day (1440 minutes)
+        steps = 1440
+        step = np.timedelta64(1, "m")
+        hour_fraction = np.arange(steps) / 60
     else:
-        # Generate data for each hour (original behavior)
-        for hour in range(24):
-            # Outdoor temperature model (lowest at 5am, highest at 3pm)
-            temp = temp_min + temp_range * math.sin(math.pi * (hour - 5) / 12) ** 2
-
-            # Humidity model
-            humidity = 70 - 30 * math.sin(math.pi * (hour - 5) / 12) ** 2
-
-            # Solar radiation (0 at night, peak at noon)
-            if 7 <= hour <= 17:  # Daylight hours
-                solar_factor = math.sin(math.pi * (hour - 7) / 10)
-                if season == "summer":
-                    max_solar = 800
-                elif season == "winter":
-                    max_solar = 500
-                else:
-                    max_solar = 650
-                solar_ghi = max_solar * solar_factor
-            else:
-                solar_ghi = 0
-
-            # Wind speed and direction
-            wind_speed = 5 + 5 * math.sin(hour / 12 * math.pi)
-            wind_direction = (hour * 15) % 360
-
-            # Create weather data point with timestamp
-            current_time = base_time + timedelta(hours=hour)
-            weather_data.append(
-                {
-                    "time": current_time,
-                    "temperature": temp,
-                    "humidity": humidity,
-                    "solar_ghi": solar_ghi,
-                    "wind_speed": wind_speed,
-                    "wind_direction": wind_direction,
-                }
-            )
+        # One sample for each hour (original behavior)
+        steps = 24
+        step = np.timedelta64(60, "m")
+        hour_fraction = np.arange(steps, dtype=np.float64)
+    hour = np.floor(hour_fraction)
 
-    return weather_data
+    # Calculate hour in radians for sinusoidal pattern (lowest at 5am, highest at 3pm)
+    sin_sq = np.sin(np.pi * (hour_fraction - 5) / 12) ** 2
+
+    # Outdoor temperature model
+    temp = temp_min + temp_range * sin_sq
+
+    # Humidity model (highest at night/morning, lowest in afternoon)
+    humidity = 70 - 30 * sin_sq
+
+    # Solar radiation (0 at night, peak at noon)
+    daylight = (hour >= 7) & (hour <= 17)
+    solar_ghi = np.where(daylight, max_solar * np.sin(np.pi * (hour_fraction - 7) / 10), 0.0)
+
+    # Wind speed and direction
+    wind_speed = 5 + 5 * np.sin(hour_fraction / 12 * np.pi)
+    wind_direction = hour.astype(np.int64) * 15
+
+    if minute_resolution:
+        # Add small random fluctuations for more realistic data
+        temp += np.random.uniform(-0.2, 0.2, steps)
+        humidity += np.random.uniform(-1, 1, steps)
+        wind_speed += np.random.uniform(-0.5, 0.5, steps)
+        wind_direction += np.random.randint(-5, 6, steps)
+    wind_direction %= 360
+
+    return WeatherSeries(
+        time=np.datetime64(base_time, "m") + np.arange(steps) * step,
+        temperature=temp,
+        humidity=humidity,
+        wet_bulb=estimate_wet_bulb(temp, humidity),
+        solar_ghi=solar_ghi,
+        wind_speed=wind_speed,
+        wind_direction=wind_direction,
+    )
 
 
 def estimate_wet_bulb(dry_bulb, relative_humidity):
-    """Estimate wet bulb temperature from dry bulb and relative humidity."""
+    """Estimate wet bulb temperature from dry bulb and relative humidity.
+
+    Accepts scalars or equal-length arrays, so a whole day of weather can be
+    converted in one call.
+    """
     # Simplified equation for wet bulb calculation
     wet_bulb = (
-        dry_bulb * math.atan(0.151977 * math.sqrt(relative_humidity + 8.313659))
-        + math.atan(dry_bulb + relative_humidity)
-        - math.atan(relative_humidity - 1.676331)
-        + 0.00391838 * (relative_humidity) ** (3 / 2) * math.atan(0.023101 * relative_humidity)
+        dry_bulb * np.arctan(0.151977 * np.sqrt(relative_humidity + 8.313659))
+        + np.arctan(dry_bulb + relative_humidity)
+        - np.arctan(relative_humidity - 1.676331)
+        + 0.00391838 * (relative_humidity) ** (3 / 2) * np.arctan(0.023101 * relative_humidity)
         - 4.686035
     )
 
     # Ensure wet bulb is less than or equal to dry bulb
-    return min(wet_bulb, dry_bulb)
+    return np.minimum(wet_bulb, dry_bulb)
 
 
 async def create_building_controller(network_name, device_id=1000, mac_address="0x01"):
@@ -497,21 +641,16 @@ async def create_building_controller(network_name, device_id=1000, mac_address="
         return None
 
 
-async def update_bacnet_devices(building):
-    """Update all BACnet devices in the building."""
-    # Update building BACnet device
-    if hasattr(building, "update_bacnet_device"):
-        await building.update_bacnet_device()
+def get_bacnet_updatable(building):
+    """Return the building and the equipment in it that expose a BACnet device."""
+    equipment = [building, *building.air_handling_units.values(), *building.zones.values()]
+    return [item for item in equipment if hasattr(item, "update_bacnet_device")]
 
-    # Update AHU BACnet devices
-    for ahu in building.air_handling_units.values():
-        if hasattr(ahu, "update_bacnet_device"):
-            await ahu.update_bacnet_device()
 
-    # Update VAV BACnet devices
-    for vav in building.zones.values():
-        if hasattr(vav, "update_bacnet_device"):
-            await vav.update_bacnet_device()
+async def update_bacnet_devices(devices):
+    """Update the BACnet devices of the given equipment (see get_bacnet_updatable)."""
+    # Each device only writes its own objects, so the updates can run together
+    await asyncio.gather(*(device.update_bacnet_device() for device in devices))
 
 
 async def run_building_simulation(building, weather_data, minutes_per_second=1):
@@ -520,103 +659,134 @@ async def run_building_simulation(building, weather_data, minutes_per_second=1):
 
     Args:
         building: Building object to simulate
-        weather_data: List of weather data points
+        weather_data: WeatherSeries for the simulated day
         minutes_per_second: Simulation speed (minutes of sim time per second of real time)
     """
     # Calculate sleep time based on simulation speed
     sleep_time = 1 / minutes_per_second
 
     print(f"\nStarting building simulation for {building.name}...")
-    print(f"Speed: {minutes_per_second}x (1 minute per {sleep_time:.1f} seconds)")
+    if REALTIME:
+        print(f"Speed: {minutes_per_second}x (1 minute per {sleep_time:.1f} seconds)")
+    else:
+        print("Speed: unpaced (set HVACSIM_REALTIME=1 to run in real time)")
     print(f"Equipment: {len(building.air_handling_units)} AHUs, {len(building.zones)} VAV boxes")
 
     # Set initial weather data
+    ws = weather_data
     current_data_index = 0
-    current_data = weather_data[current_data_index]
+    i = current_data_index
 
     # Set simulation start time
-    building.set_time(current_data["time"])
+    building.set_time(ws.time[i].astype(object))
 
     # Set initial outdoor conditions
     building.set_outdoor_conditions(
-        temperature=current_data["temperature"],
-        humidity=current_data["humidity"],
-        wind_speed=current_data.get("wind_speed", 0),
-        wind_direction=current_data.get("wind_direction", 0),
-        solar_ghi=current_data.get("solar_ghi", 0),
+        temperature=ws.temperature[i],
+        humidity=ws.humidity[i],
+        wind_speed=ws.wind_speed[i],
+        wind_direction=ws.wind_direction[i],
+        solar_ghi=ws.solar_ghi[i],
+    )
+
+    # Preallocate one day of log storage; each tick overwrites the row for its
+    # minute, so long runs keep the most recent day without growing
+    steps = len(ws)
+    zone_names = list(building.zones)
+    data_log.update(
+        time=np.zeros(steps, dtype=np.int16),  # minute of day; format as HH:MM on export
+        outdoor_temp=np.zeros(steps),
+        total_energy=np.zeros(steps),
+        cooling_energy=np.zeros(steps),
+        heating_energy=np.zeros(steps),
+        zone_names=zone_names,
+        zone_temp=np.zeros((steps, len(zone_names))),
     )
+    log_time = data_log["time"]
+    log_outdoor_temp = data_log["outdoor_temp"]
+    log_total_energy = data_log["total_energy"]
+    log_cooling_energy = data_log["cooling_energy"]
+    log_heating_energy = data_log["heating_energy"]
+    log_zone_temp = data_log["zone_temp"]
+
+    # Equipment is fixed once the simulation starts, so resolve the BACnet
+    # updaters once rather than probing every object on every tick
+    bacnet_devices = get_bacnet_updatable(building)
 
     try:
         while not exit_event.is_set():
+            tick_start = time.monotonic()
+
             # Update to current weather data
-            current_data = weather_data[current_data_index % len(weather_data)]
+            i = current_data_index % len(ws)
 
             # Update building's outdoor conditions
             building.set_outdoor_conditions(
-                temperature=current_data["temperature"],
-                humidity=current_data["humidity"],
-                wind_speed=current_data.get("wind_speed", 0),
-                wind_direction=current_data.get("wind_direction", 0),
-                solar_ghi=current_data.get("solar_ghi", 0),
+                temperature=ws.temperature[i],
+                humidity=ws.humidity[i],
+                wind_speed=ws.wind_speed[i],
+                wind_direction=ws.wind_direction[i],
+                solar_ghi=ws.solar_ghi[i],
             )
 
             # Set simulation time
-            building.set_time(current_data["time"])
+            building.set_time(ws.time[i].astype(object))
 
-            # Run a simulation step
-            result = building.run_simulation_step(minutes=1)
+            # Run a simulation step in a worker thread so the event loop keeps
+            # serving BACnet traffic meanwhile. Nothing else touches the building
+            # until the step returns, and the device update below runs after it.
+            result = await asyncio.to_thread(building.run_simulation_step, minutes=1)
 
             # Update BACnet devices
-            await update_bacnet_devices(building)
+            await update_bacnet_devices(bacnet_devices)
+
+            hour, minute = building.get_time_of_day()
+            zone_temps = result["zone_temps"]
+            energy = result["energy"]
 
             # Log data
-            time_str = f"{building.get_time_of_day()[0]:02d}:{building.get_time_of_day()[1]:02d}"
-            data_log["time"].append(time_str)
-            data_log["outdoor_temp"].append(building.outdoor_temp)
+            log_time[i] = hour * 60 + minute
+            log_outdoor_temp[i] = building.outdoor_temp
 
-            # Log zone temperatures
-            for zone_name, zone_temp in result["zone_temps"].items():
-                data_log[f"{zone_name}_temp"].append(zone_temp)
+            # Log zone temperatures (same order as zone_names)
+            log_zone_temp[i] = tuple(zone_temps.values())
 
             # Log energy usage
-            data_log["total_energy"].append(result["energy"]["total"])
-            data_log["cooling_energy"].append(result["energy"]["cooling"])
-            data_log["heating_energy"].append(result["energy"]["heating"])
+            log_total_energy[i] = energy["total"]
+            log_cooling_energy[i] = energy["cooling"]
+            log_heating_energy[i] = energy["heating"]
 
             # Display current simulation time and key values
             # Only print updates every 5 minutes to reduce console output
-            if building.get_time_of_day()[1] % 5 == 0:
-                hour, minute = building.get_time_of_day()
-                time_str = f"{hour:02d}:{minute:02d}"
-
-                print(f"\n--- Simulation Time: {time_str} ---")
+            if minute % 5 == 0:
+                print(f"\n--- Simulation Time: {hour:02d}:{minute:02d} ---")
                 print(
                     f"Outdoor: {building.outdoor_temp:.1f}°F, {building.outdoor_humidity:.0f}% RH"
                 )
 
                 # Show zone temperatures
                 zone_temp_str = ", ".join(
-                    [
-                        f"{name}: {temp:.1f}°F"
-                        for name, temp in list(result["zone_temps"].items())[:3]
-                    ]
+                    [f"{name}: {temp:.1f}°F" for name, temp in list(zone_temps.items())[:3]]
                 )
-                if len(result["zone_temps"]) > 3:
-                    zone_temp_str += f" ... ({len(result["zone_temps"]) - 3} more zones)"
+                if len(zone_temps) > 3:
+                    zone_temp_str += f" ... ({len(zone_temps) - 3} more zones)"
                 print(f"Zone Temperatures: {zone_temp_str}")
 
                 # Show energy usage
                 print(
-                    f"Energy: Cooling {result['energy']['cooling']/1000:.1f} kBTU/h, "
-                    + f"Heating {result['energy']['heating']/1000:.1f} kBTU/h, "
-                    + f"Total {result['energy']['total']/1000:.1f} kBTU/h"
+                    f"Energy: Cooling {energy['cooling']/1000:.1f} kBTU/h, "
+                    + f"Heating {energy['heating']/1000:.1f} kBTU/h, "
+                    + f"Total {energy['total']/1000:.1f} kBTU/h"
                 )
 
             # Move to next weather data point
             current_data_index += 1
 
-            # Sleep for the appropriate time to maintain simulation speed
-            await asyncio.sleep(sleep_time)
+            # Sleep for what is left of this tick's time slot; a tick that overran
+            # still sleeps 0 so the event loop gets to service BACnet traffic
+            # (in batch mode every tick just yields)
+            elapsed = time.monotonic() - tick_start
+            await asyncio.sleep(max(0.0, sleep_time - elapsed) if REALTIME else 0)
 
     except asyncio.CancelledError:
         print(f"\nSimulation for {building.name} cancelled.")
@@ -629,37 +799,111 @@ async def run_building_simulation(building, weather_data, minutes_per_second=1):
         print(f"Simulation for {building.name} stopped.")
 
 
-async def create_vav_from_schema(vav_data, device_id_base=1000):
-    """Create a VAV box based on BRICK schema data."""
-    # Extract room name from the VAV name
-    room_id = vav_data.get("feeds", [""])[0]
+def register_bacnet_device(equipment, device_id, device_name, network_name):
+    """Create the BACnet device for a piece of equipment and track it for shutdown."""
+    app = equipment.create_bacpypes3_device(
+        device_id=device_id,
+        device_name=device_name,
+        network_interface_name=network_name,
+        mac_address=f"0x{device_id:x}",
+    )
+    if app:
+        all_devices.append(app)
+    return app
+
 
-    # Determine if this VAV has reheat
-    has_reheat = vav_data.get("has_reheat", False)
+def build_cooling_plant(chiller_data, device_id, network_name):
+    """Create the chiller and cooling tower, plus their BACnet devices if available.
 
-    # Determine VAV parameters based on type and zone
-    # These are reasonable defaults - in a real system they would be extracted from BMS databases
-    min_airflow = random.uniform(150, 250)  # Realistic low end for a VAV box
-    max_airflow = random.uniform(1000, 1800)  # Realistic high end
-    zone_temp_setpoint = random.uniform(70, 73)  # Standard office setpoints
-
-    # Create the VAV box with these parameters
-    vav = VAVBox(
-        name=vav_data["id"],
-        min_airflow=min_airflow,
-        max_airflow=max_airflow,
-        zone_temp_setpoint=zone_temp_setpoint,
-        deadband=2,
-        discharge_air_temp_setpoint=55,
-        has_reheat=has_reheat,
-        zone_area=random.uniform(800, 1200),  # Reasonable office zone size
-        zone_volume=random.uniform(8000, 12000),  # Assuming 10ft ceilings
-        window_area=random.uniform(80, 150),  # Reasonable window area
-        window_orientation=random.choice(["north", "south", "east", "west"]),
-        thermal_mass=random.uniform(1.5, 2.5),  # Medium to high thermal mass
+    Args:
+        chiller_data: Chiller entry from the BRICK schema, or None for a default plant
+        device_id: First BACnet device ID to assign
+        network_name: Virtual network the devices join
+
+    Returns:
+        Tuple of (chiller, cooling_tower, next unused device ID)
+    """
+    if chiller_data:
+        print(f"\nCreating cooling plant with chiller: {chiller_data['id']}")
+    else:
+        print("\nNo chiller found in schema, creating default cooling plant")
+
+    # Create cooling tower
+    cooling_tower = CoolingTower(
+        name="CT-1",
+        capacity=400,  # tons
+        design_approach=5,  # °F
+        design_range=10,  # °F
+        design_wet_bulb=78,  # °F
+        min_speed=20,  # %
+        tower_type="counterflow",
+        fan_power=40,  # kW
+        num_cells=2,
     )
 
-    return vav
+    # Create chiller
+    chiller = Chiller(
+        name=chiller_data["id"] if chiller_data else "Chiller-1",
+        cooling_type="water_cooled",
+        capacity=350,  # tons
+        design_cop=6.0,
+        design_entering_condenser_temp=85,  # °F
+        design_leaving_chilled_water_temp=44,  # °F
+        min_part_load_ratio=0.1,
+        design_chilled_water_flow=800,  # GPM
+        design_condenser_water_flow=1200,  # GPM
+    )
+
+    # Create BACnet devices for chiller and cooling tower
+    if BACPYPES_AVAILABLE:
+        for equipment, device_name in (
+            (chiller, f"Chiller-{chiller.name}"),
+            (cooling_tower, f"CoolingTower-{cooling_tower.name}"),
+        ):
+            register_bacnet_device(equipment, device_id, device_name, network_name)
+            device_id += 1
+
+    # Connect the cooling plant components
+    chiller.connect_cooling_tower(cooling_tower)
+
+    return chiller, cooling_tower, device_id
+
+
+def create_vavs_from_schema(vavs_data):
+    """Create VAV boxes based on BRICK schema data, one per entry in vavs_data."""
+    count = len(vavs_data)
+
+    # Determine VAV parameters based on type and zone
+    # These are reasonable defaults - in a real system they would be extracted from BMS databases.
+    # All random parameters are drawn for every VAV at once.
+    rng = np.random.default_rng()
+    min_airflows = rng.uniform(150, 250, count)  # Realistic low end for a VAV box
+    max_airflows = rng.uniform(1000, 1800, count)  # Realistic high end
+    zone_temp_setpoints = rng.uniform(70, 73, count)  # Standard office setpoints
+    zone_areas = rng.uniform(800, 1200, count)  # Reasonable office zone size
+    zone_volumes = rng.uniform(8000, 12000, count)  # Assuming 10ft ceilings
+    window_areas = rng.uniform(80, 150, count)  # Reasonable window area
+    orientations = rng.choice(["north", "south", "east", "west"], count)
+    thermal_masses = rng.uniform(1.5, 2.5, count)  # Medium to high thermal mass
+
+    # Create the VAV boxes with these parameters
+    return [
+        VAVBox(
+            name=vav_data["id"],
+            min_airflow=float(min_airflows[i]),
+            max_airflow=float(max_airflows[i]),
+            zone_temp_setpoint=float(zone_temp_setpoints[i]),
+            deadband=2,
+            discharge_air_temp_setpoint=55,
+            has_reheat=vav_data.get("has_reheat", False),
+            zone_area=float(zone_areas[i]),
+            zone_volume=float(zone_volumes[i]),
+            window_area=float(window_areas[i]),
+            window_orientation=str(orientations[i]),
+            thermal_mass=float(thermal_masses[i]),
+        )
+        for i, vav_data in enumerate(vavs_data)
+    ]
 
 
 async def shutdown():
@@ -673,25 +917,27 @@ async def shutdown():
 
     # Close all BACnet devices if using BACpypes
     if all_devices:
-        for app in all_devices:
+        # Iterate over a snapshot and clear once at the end; removing from the
+        # list while looping over it skipped every other device
+        for app in list(all_devices):
             try:
                 device_name = "unknown"
                 device_id = 0
 
-                # Find the device object
-                for obj in app.objectIdentifier.values():
-                    if hasattr(obj, "objectIdentifier") and obj.objectIdentifier[0] == "device":
-                        device_name = getattr(obj, "objectName", "unknown")
-                        device_id = obj.objectIdentifier[1]
-                        break
+                # The application keeps a reference to its device object
+                device_obj = getattr(app, "device_object", None)
+                if device_obj is not None:
+                    device_name = getattr(device_obj, "objectName", "unknown")
+                    device_id = device_obj.objectIdentifier[1]
 
                 print(f"Cleaning up BACnet device: {device_name} (ID: {device_id})")
                 app.close()
-                all_devices.remove(app)
 
             except Exception as e:
                 print(f"Error during device cleanup: {e}")
 
+        all_devices.clear()
+
     print("Shutdown complete.")
 
 
@@ -717,8 +963,7 @@ async def main():
 
         # Parse the BRICK schema file
         print("Parsing BRICK schema file: bldg1.ttl")
-        parser = BrickParser("data/brick_schemas/bldg30.ttl")
-        building_structure = parser.extract_all_equipment()
+        building_structure = load_building_structure("data/brick_schemas/bldg30.ttl")
 
         print("\nExtracted building structure:")
         print(f"Building: {building_structure['building'].get('name', 'Unknown')}")
@@ -732,8 +977,8 @@ async def main():
         print("Generated 24-hour weather data with minute resolution for simulation")
 
         # Create virtual BACnet network if BACpypes is available
+        network_name = "hvac-network"
         if BACPYPES_AVAILABLE:
-            network_name = "hvac-network"
             print(f"Creating virtual BACnet network: {network_name}")
             virtual_network = VirtualNetwork(network_name)
             print(f"Network created successfully: {virtual_network}")
@@ -768,43 +1013,37 @@ async def main():
             )
 
         # Create the VAV boxes based on BRICK schema
-        vav_boxes = []
         device_id_base = 1000
 
         print("\nCreating VAV boxes based on schema:")
-        for vav_id, vav_data in building_structure["vavs"].items():
-            print(f"Creating VAV box: {vav_id}")
-            vav = await create_vav_from_schema(vav_data, device_id_base)
-            vav_boxes.append(vav)
+        vav_boxes = create_vavs_from_schema(list(building_structure["vavs"].values()))
+        for index, vav in enumerate(vav_boxes, start=1):
+            print(f"Creating VAV box: {vav.name}")
 
             # Add to building
             building.add_zone(vav)
 
             # Create BACnet device if available
             if BACPYPES_AVAILABLE:
-                device_id = device_id_base + len(vav_boxes)
-                mac_address = f"0x{device_id:x}"
-
-                app = vav.create_bacpypes3_device(
-                    device_id=device_id,
-                    device_name=f"VAV-{vav.name}",
-                    network_interface_name=network_name,
-                    mac_address=mac_address,
-                )
-                if app:
-                    all_devices.append(app)
+                register_bacnet_device(vav, device_id_base + index, f"VAV-{vav.name}", network_name)
 
         # Create AHUs based on BRICK schema
         device_id = 2000
 
         print("\nCreating AHUs based on schema:")
+
+        # Index VAV boxes by name so each AHU can resolve its feeds directly
+        vav_by_name = {vav.name: vav for vav in vav_boxes}
+
         for ahu_id, ahu_data in building_structure["ahus"].items():
             # Determine which VAV boxes are fed by this AHU
             vav_list = []
+            total_max_airflow = 0
             for vav_id in ahu_data["feeds"]:
-                vav = next((v for v in vav_boxes if v.name == vav_id), None)
+                vav = vav_by_name.get(vav_id)
                 if vav:
                     vav_list.append(vav)
+                    total_max_airflow += vav.max_airflow
 
             # Create the AHU with appropriate configuration
             print(f"Creating AHU: {ahu_id} with {len(vav_list)} VAV boxes")
@@ -815,24 +1054,14 @@ async def main():
                 supply_air_temp_setpoint=55,
                 min_supply_air_temp=52,
                 max_supply_air_temp=65,
-                max_supply_airflow=sum(vav.max_airflow for vav in vav_list)
-                * 1.2,  # 20% safety factor
+                max_supply_airflow=total_max_airflow * 1.2,  # 20% safety factor
                 vav_boxes=vav_list,
                 enable_supply_temp_reset=True,
             )
 
             # Create BACnet device if available
             if BACPYPES_AVAILABLE:
-                mac_address = f"0x{device_id:x}"
-
-                ahu_app = ahu.create_bacpypes3_device(
-                    device_id=device_id,
-                    device_name=f"AHU-{ahu.name}",
-                    network_interface_name=network_name,
-                    mac_address=mac_address,
-                )
-                if ahu_app:
-                    all_devices.append(ahu_app)
+                register_bacnet_device(ahu, device_id, f"AHU-{ahu.name}", network_name)
 
             # Add to building
             building.add_air_handling_unit(ahu)
@@ -842,110 +1071,9 @@ async def main():
 
         # Create cooling plant based on chillers in BRICK schema
         chiller_data = next(iter(building_structure["chillers"].values()), None)
-
-        if chiller_data:
-            print(f"\nCreating cooling plant with chiller: {chiller_data['id']}")
-
-            # Create cooling tower
-            cooling_tower = CoolingTower(
-                name="CT-1",
-                capacity=400,  # tons
-                design_approach=5,  # °F
-                design_range=10,  # °F
-                design_wet_bulb=78,  # °F
-                min_speed=20,  # %
-                tower_type="counterflow",
-                fan_power=40,  # kW
-                num_cells=2,
-            )
-
-            # Create chiller
-            chiller = Chiller(
-                name=chiller_data["id"],
-                cooling_type="water_cooled",
-                capacity=350,  # tons
-                design_cop=6.0,
-                design_entering_condenser_temp=85,  # °F
-                design_leaving_chilled_water_temp=44,  # °F
-                min_part_load_ratio=0.1,
-                design_chilled_water_flow=800,  # GPM
-                design_condenser_water_flow=1200,  # GPM
-            )
-
-            # Create BACnet devices for chiller and cooling tower
-            if BACPYPES_AVAILABLE:
-                chiller_app = chiller.create_bacpypes3_device(
-                    device_id=device_id,
-                    device_name=f"Chiller-{chiller.name}",
-                    network_interface_name=network_name,
-                    mac_address=f"0x{device_id:x}",
-                )
-                device_id += 1
-
-                cooling_tower_app = cooling_tower.create_bacpypes3_device(
-                    device_id=device_id,
-                    device_name=f"CoolingTower-{cooling_tower.name}",
-                    network_interface_name=network_name,
-                    mac_address=f"0x{device_id:x}",
-                )
-                device_id += 1
-
-                all_devices.append(chiller_app)
-                all_devices.append(cooling_tower_app)
-
-            # Connect the cooling plant components
-            chiller.connect_cooling_tower(cooling_tower)
-        else:
-            # Default cooling plant if none in schema
-            print("\nNo chiller found in schema, creating default cooling plant")
-
-            cooling_tower = CoolingTower(
-                name="CT-1",
-                capacity=400,
-                design_approach=5,
-                design_range=10,
-                design_wet_bulb=78,
-                min_speed=20,
-                tower_type="counterflow",
-                fan_power=40,
-                num_cells=2,
-            )
-
-            chiller = Chiller(
-                name="Chiller-1",
-                cooling_type="water_cooled",
-                capacity=350,
-                design_cop=6.0,
-                design_entering_condenser_temp=85,
-                design_leaving_chilled_water_temp=44,
-                min_part_load_ratio=0.1,
-                design_chilled_water_flow=800,
-                design_condenser_water_flow=1200,
-            )
-
-            # Default BACnet devices
-            if BACPYPES_AVAILABLE:
-                chiller_app = chiller.create_bacpypes3_device(
-                    device_id=device_id,
-                    device_name=f"Chiller-{chiller.name}",
-                    network_interface_name=network_name,
-                    mac_address=f"0x{device_id:x}",
-                )
-                device_id += 1
-
-                cooling_tower_app = cooling_tower.create_bacpypes3_device(
-                    device_id=device_id,
-                    device_name=f"CoolingTower-{cooling_tower.name}",
-                    network_interface_name=network_name,
-                    mac_address=f"0x{device_id:x}",
-                )
-                device_id += 1
-
-                all_devices.append(chiller_app)
-                all_devices.append(cooling_tower_app)
-
-            # Connect default cooling plant components
-            chiller.connect_cooling_tower(cooling_tower)
+        chiller, cooling_tower, device_id = build_cooling_plant(
+            chiller_data, device_id, network_name
+        )
 
         # Create a boiler for heating
         print("\nCreating boiler for heating system")
@@ -964,17 +1092,9 @@ async def main():
 
         # Create BACnet device for boiler
         if BACPYPES_AVAILABLE:
-            boiler_app = boiler.create_bacpypes3_device(
-                device_id=device_id,
-                device_name=f"Boiler-{boiler.name}",
-                network_interface_name=network_name,
-                mac_address=f"0x{device_id:x}",
-            )
+            register_bacnet_device(boiler, device_id, f"Boiler-{boiler.name}", network_name)
             device_id += 1
 
-            if boiler_app:
-                all_devices.append(boiler_app)
-
         # Define minutes per second for real-time simulation (1 minute of simulation time per 1 second of real time)
         simulation_speed = 1  # 1 minute per second
 
@@ -994,7 +1114,10 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if UVLOOP_AVAILABLE:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         # This will be handled by the signal handler in main()
         pass
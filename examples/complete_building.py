@@ -11,7 +11,9 @@ This example does NOT include BACnet networking - see example_bacnet_simulation.
 for BACnet integration.
 """
 
+import os
 import time
+from collections import Counter
 
 from src.vav_box import VAVBox
 from src.ahu import AirHandlingUnit
@@ -19,6 +21,10 @@ from src.chiller import Chiller
 from src.cooling_tower import CoolingTower
 from src.boiler import Boiler
 
+# Run steps back to back unless HVACSIM_REALTIME=1 asks for demo pacing
+# (see examples/README.md)
+REALTIME = os.environ.get("HVACSIM_REALTIME", "0") == "1"
+
 
 def create_vav_boxes(ahu_name: str, count: int, orientations: list[str]) -> list[VAVBox]:
     """Create VAV boxes for an AHU.
@@ -31,10 +37,19 @@ def create_vav_boxes(ahu_name: str, count: int, orientations: list[str]) -> list
     Returns:
         List of VAVBox instances
     """
-    vavs = []
-    for i in range(1, count + 1):
-        orientation = orientations[(i - 1) % len(orientations)]
-        vav = VAVBox(
+    # Window and mass parameters depend only on orientation, so derive them once per
+    # orientation; interior zones have no windows and more thermal mass
+    zone_params = {
+        orientation: (
+            {"window_area": 0, "window_orientation": "north", "thermal_mass": 3.0}
+            if orientation == "interior"
+            else {"window_area": 60, "window_orientation": orientation, "thermal_mass": 2.0}
+        )
+        for orientation in orientations
+    }
+
+    return [
+        VAVBox(
             name=f"{ahu_name}-VAV-{i:02d}",
             min_airflow=100,
             max_airflow=800,
@@ -44,12 +59,10 @@ def create_vav_boxes(ahu_name: str, count: int, orientations: list[str]) -> list
             has_reheat=True,
             zone_area=400,
             zone_volume=3200,
-            window_area=60 if orientation != "interior" else 0,
-            window_orientation=orientation if orientation != "interior" else "north",
-            thermal_mass=2.0 if orientation != "interior" else 3.0,
+            **zone_params[orientations[(i - 1) % len(orientations)]],
         )
-        vavs.append(vav)
-    return vavs
+        for i in range(1, count + 1)
+    ]
 
 
 def create_chiller_plant():
@@ -124,11 +137,7 @@ def print_status(
 
     # AHU status
     for ahu in ahus:
-        vav_modes = {}
-        for vav in ahu.vav_boxes:
-            mode = vav.mode
-            vav_modes[mode] = vav_modes.get(mode, 0) + 1
-
+        vav_modes = Counter(vav.mode for vav in ahu.vav_boxes)
         mode_str = ", ".join(f"{k}:{v}" for k, v in vav_modes.items())
         print(
             f"{ahu.name}: SAT={ahu.current_supply_air_temp:.1f}°F, "
@@ -156,7 +165,7 @@ def print_status(
         print(f"{boiler.name}: Off")
 
     # Sample zone temperatures
-    temps = list(zone_temps.values())
+    temps = zone_temps.values()  # A view; min/max/sum/len all read it without a copy
     print(f"Zone temps: min={min(temps):.1f}°F, max={max(temps):.1f}°F, avg={sum(temps)/len(temps):.1f}°F")
 
 
@@ -232,11 +241,9 @@ def main():
             total_heating_load = 0
 
             for ahu in ahus:
-                # Get zone temps for this AHU's VAVs
-                ahu_zone_temps = {
-                    vav.name: zone_temps[vav.name] for vav in ahu.vav_boxes
-                }
-                ahu.update(ahu_zone_temps, outdoor_temp=outdoor_temp)
+                # AHU.update only looks up its own VAVs by name, so the shared
+                # building-wide zone_temps dict can be passed as is
+                ahu.update(zone_temps, outdoor_temp=outdoor_temp)
 
                 # Calculate cooling/heating loads
                 energy = ahu.calculate_energy_usage()
@@ -287,7 +294,8 @@ def main():
             if step % 6 == 0:
                 print_status(minute, outdoor_temp, ahus, chiller, boiler, zone_temps)
 
-            time.sleep(0.05)  # Small delay for readability
+            if REALTIME:
+                time.sleep(0.05)  # Small delay for readability
 
     except KeyboardInterrupt:
         print("\n\nSimulation stopped by user.")
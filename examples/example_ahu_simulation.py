@@ -4,12 +4,28 @@ Example simulation demonstrating an AHU controlling multiple VAV boxes.
 This simulates a small building HVAC system over a 24-hour period.
 """
 
+import os
+from dataclasses import dataclass
+
 from src.vav_box import VAVBox
 from src.ahu import AirHandlingUnit
-import matplotlib.pyplot as plt
 import numpy as np
 
 
+@dataclass
+class ZoneState:
+    """Per-zone model state, one array element (or row) per zone."""
+
+    names: list
+    vavs: list
+    temps: np.ndarray  # (zones, time_steps) zone temperature trace
+    occupancy: np.ndarray  # (zones, time_steps) occupancy level
+    outdoor_coeffs: np.ndarray  # Share of the outdoor/zone difference gained per step
+    occ_coeffs: np.ndarray  # °F gained per step per unit of occupancy
+    vav_coeffs: np.ndarray  # Cooling/heating effect of full VAV airflow
+    max_airflows: np.ndarray
+
+
 def main():
     # Create VAV boxes for different zones
     vav_office = VAVBox(
@@ -57,33 +73,38 @@ def main():
     time_steps = 96
     hours = np.linspace(0, 24, time_steps)
 
-    # Arrays to store simulation results
-    office_temps = []
-    conference_temps = []
-    lobby_temps = []
-    supply_air_temps = []
-    office_airflows = []
-    conference_airflows = []
-    lobby_airflows = []
-    total_airflows = []
-    cooling_valve = []
-    heating_valve = []
-    cooling_energy = []
-    heating_energy = []
-    fan_energy = []
+    # Arrays to store simulation results, one element per time step
+    supply_air_temps = np.empty(time_steps)
+    total_airflows = np.empty(time_steps)
+    cooling_valve = np.empty(time_steps)
+    heating_valve = np.empty(time_steps)
+    cooling_energy = np.empty(time_steps)
+    heating_energy = np.empty(time_steps)
+    fan_energy = np.empty(time_steps)
 
     # Simulate outdoor temperature profile
-    outdoor_temps = []
-    for hour in hours:
-        # Daily temperature cycle: lowest at 5am, highest at 3pm
-        outdoor_temp = 65 + 15 * np.sin(np.pi * (hour - 5) / 12)
-        outdoor_temps.append(outdoor_temp)
+    # Daily temperature cycle: lowest at 5am, highest at 3pm
+    outdoor_temps = 65 + 15 * np.sin(np.pi * (hours - 5) / 12)
+    outdoor_temps_list = outdoor_temps.tolist()  # Plain floats for per-step scalar reads
+
+    # Set up zone temperature models (office, conference, lobby)
+    vavs = [vav_office, vav_conference, vav_lobby]
+    zones = ZoneState(
+        names=[vav.name for vav in vavs],
+        vavs=vavs,
+        temps=np.zeros((len(vavs), time_steps)),
+        occupancy=np.zeros((len(vavs), time_steps)),
+        outdoor_coeffs=np.array([0.1, 0.08, 0.15]),  # More outdoor influence in lobby
+        occ_coeffs=np.array([2.0, 3.0, 1.0]),
+        vav_coeffs=np.array([0.5, 0.7, 0.4]),
+        max_airflows=np.array([vav.max_airflow for vav in vavs], dtype=float),
+    )
+    office_temps, conference_temps, lobby_temps = zones.temps
+    vav_airflow_trace = np.empty((len(vavs), time_steps))
+    office_airflows, conference_airflows, lobby_airflows = vav_airflow_trace
 
-    # Set up zone temperature models
     # Define occupancy patterns
-    office_occupancy = np.zeros(time_steps)
-    conference_occupancy = np.zeros(time_steps)
-    lobby_occupancy = np.zeros(time_steps)
+    office_occupancy, conference_occupancy, lobby_occupancy = zones.occupancy
 
     # Office: 8am to 6pm
     office_occupancy[(hours >= 8) & (hours <= 18)] = 1.0
@@ -96,85 +117,65 @@ def main():
     # Lobby: 7am to 7pm
     lobby_occupancy[(hours >= 7) & (hours <= 19)] = 0.8
 
+    # VAV airflows and discharge temperatures from the previous step
+    vav_airflows = discharge_temps = None
+
     print("Running AHU simulation...")
     for i, hour in enumerate(hours):
+        outdoor_temp = outdoor_temps_list[i]
+
         # Calculate zone temperatures based on previous conditions, outdoor temp, and occupancy
         # Start with baseline temperatures
         if i == 0:
-            office_temp = 72
-            conference_temp = 70
-            lobby_temp = 74
+            zones.temps[:, 0] = [72, 70, 74]
         else:
             # Simple thermal model: zone temperature is affected by:
             # 1. Previous temperature (thermal mass)
             # 2. Outdoor temperature influence
             # 3. Occupancy heat gain
             # 4. Cooling/heating effect from VAV (from previous step)
+            # All zones are updated at once, one array element per zone.
+            prev_temps = zones.temps[:, i - 1]
+            airflows = np.array(vav_airflows)
 
-            # Office zone
-            outdoor_influence = 0.1 * (outdoor_temps[i - 1] - office_temps[i - 1])
-            occupancy_gain = 2 * office_occupancy[i - 1]
+            outdoor_influence = zones.outdoor_coeffs * (outdoor_temps_list[i - 1] - prev_temps)
+            occupancy_gain = zones.occ_coeffs * zones.occupancy[:, i - 1]
             vav_effect = (
-                -0.5
-                * (vav_office.current_airflow / vav_office.max_airflow)
-                * (office_temps[i - 1] - vav_office.get_discharge_air_temp())
+                -zones.vav_coeffs * (airflows / zones.max_airflows) * (prev_temps - discharge_temps)
             )
-            office_temp = office_temps[i - 1] + outdoor_influence + occupancy_gain + vav_effect
+            zones.temps[:, i] = prev_temps + outdoor_influence + occupancy_gain + vav_effect
 
-            # Conference zone
-            outdoor_influence = 0.08 * (outdoor_temps[i - 1] - conference_temps[i - 1])
-            occupancy_gain = 3 * conference_occupancy[i - 1]
-            vav_effect = (
-                -0.7
-                * (vav_conference.current_airflow / vav_conference.max_airflow)
-                * (conference_temps[i - 1] - vav_conference.get_discharge_air_temp())
-            )
-            conference_temp = (
-                conference_temps[i - 1] + outdoor_influence + occupancy_gain + vav_effect
-            )
-
-            # Lobby zone
-            outdoor_influence = 0.15 * (
-                outdoor_temps[i - 1] - lobby_temps[i - 1]
-            )  # More outdoor influence in lobby
-            occupancy_gain = 1 * lobby_occupancy[i - 1]
-            vav_effect = (
-                -0.4
-                * (vav_lobby.current_airflow / vav_lobby.max_airflow)
-                * (lobby_temps[i - 1] - vav_lobby.get_discharge_air_temp())
-            )
-            lobby_temp = lobby_temps[i - 1] + outdoor_influence + occupancy_gain + vav_effect
+        office_temp, conference_temp, lobby_temp = zones.temps[:, i].tolist()
 
         # Update AHU with current zone temperatures
-        zone_temps = {"Office": office_temp, "Conference": conference_temp, "Lobby": lobby_temp}
+        zone_temps = dict(zip(zones.names, (office_temp, conference_temp, lobby_temp)))
 
-        ahu.update(zone_temps, outdoor_temps[i])
+        ahu.update(zone_temps, outdoor_temp)
+
+        # Read the VAV outputs once; they feed this step's results and the next
+        # step's thermal model
+        vav_airflows = [vav.current_airflow for vav in zones.vavs]
+        discharge_temps = np.array([vav.get_discharge_air_temp() for vav in zones.vavs])
+        office_airflow, conference_airflow, lobby_airflow = vav_airflows
 
         # Store results
-        office_temps.append(office_temp)
-        conference_temps.append(conference_temp)
-        lobby_temps.append(lobby_temp)
-        supply_air_temps.append(ahu.current_supply_air_temp)
-        office_airflows.append(vav_office.current_airflow)
-        conference_airflows.append(vav_conference.current_airflow)
-        lobby_airflows.append(vav_lobby.current_airflow)
-        total_airflows.append(ahu.current_total_airflow)
-        cooling_valve.append(ahu.cooling_valve_position * 100)  # Convert to percentage
-        heating_valve.append(ahu.heating_valve_position * 100)  # Convert to percentage
+        supply_air_temps[i] = ahu.current_supply_air_temp
+        vav_airflow_trace[:, i] = vav_airflows
+        total_airflows[i] = ahu.current_total_airflow
+        cooling_valve[i] = ahu.cooling_valve_position * 100  # Convert to percentage
+        heating_valve[i] = ahu.heating_valve_position * 100  # Convert to percentage
 
         energy = ahu.calculate_energy_usage()
-        cooling_energy.append(energy["cooling"] / 1000)  # Convert to kBTU/hr
-        heating_energy.append(energy["heating"] / 1000)  # Convert to kBTU/hr
-        fan_energy.append(energy["fan"] / 1000)  # Convert to kBTU/hr
+        cooling_energy[i] = energy["cooling"] / 1000  # Convert to kBTU/hr
+        heating_energy[i] = energy["heating"] / 1000  # Convert to kBTU/hr
+        fan_energy[i] = energy["fan"] / 1000  # Convert to kBTU/hr
 
         # Print status at whole hours
         if hour % 3 == 0:
-            print(f"Hour {int(hour)}: Outdoor Temp: {outdoor_temps[i]:.1f}°F")
-            print(f"  Office: {office_temp:.1f}°F, Airflow: {vav_office.current_airflow:.0f} CFM")
-            print(
-                f"  Conference: {conference_temp:.1f}°F, Airflow: {vav_conference.current_airflow:.0f} CFM"
-            )
-            print(f"  Lobby: {lobby_temp:.1f}°F, Airflow: {vav_lobby.current_airflow:.0f} CFM")
+            print(f"Hour {int(hour)}: Outdoor Temp: {outdoor_temp:.1f}°F")
+            print(f"  Office: {office_temp:.1f}°F, Airflow: {office_airflow:.0f} CFM")
+            print(f"  Conference: {conference_temp:.1f}°F, Airflow: {conference_airflow:.0f} CFM")
+            print(f"  Lobby: {lobby_temp:.1f}°F, Airflow: {lobby_airflow:.0f} CFM")
             print(
                 f"  AHU: Supply Temp: {ahu.current_supply_air_temp:.1f}°F, Total Airflow: {ahu.current_total_airflow:.0f} CFM"
             )
@@ -224,7 +225,17 @@ def plot_results(
     heating_energy,
     fan_energy,
 ):
-    """Generate plots of the simulation results."""
+    """Generate plots of the simulation results.
+
+    Set HVACSIM_PLOT=0 to skip plotting (and the matplotlib import), e.g. for
+    headless or benchmark runs.
+    """
+    if os.environ.get("HVACSIM_PLOT", "1") == "0":
+        return
+
+    # Imported here so runs that skip plotting don't pay matplotlib's import cost
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(12, 20))
 
     # Plot 1: Temperatures
@@ -279,7 +290,7 @@ def plot_results(
     plt.plot(hours, fan_energy, "g-", label="Fan Energy (kBTU/hr)")
     plt.plot(
         hours,
-        [c + h + f for c, h, f in zip(cooling_energy, heating_energy, fan_energy)],
+        np.asarray(cooling_energy) + np.asarray(heating_energy) + np.asarray(fan_energy),
         "k--",
         label="Total Energy (kBTU/hr)",
     )
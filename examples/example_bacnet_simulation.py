@@ -10,6 +10,19 @@ import asyncio
 
 from src.vav_box import VAVBox
 
+# 24-hour outdoor temperature pattern (sine wave), coldest at 5 AM, warmest at 5 PM
+OUTDOOR_TEMPS = tuple(65 + 15 * math.sin(math.pi * (hour - 5) / 12) for hour in range(24))
+
+# Office occupied from 8 AM to 6 PM
+OCCUPIED_HOURS = frozenset(range(8, 18))
+
+# Thermal-model VAV effect by operating mode: positive for cooling, negative for
+# heating; modes not listed (e.g. deadband) have no effect
+MODE_EFFECTS = {
+    "cooling": lambda vav: vav.current_airflow / vav.max_airflow,
+    "heating": lambda vav: -vav.reheat_valve_position if vav.has_reheat else 0,
+}
+
 # Create a VAV box with some configuration
 vav = VAVBox(
     name="Office-1",
@@ -55,12 +68,6 @@ async def run_simulation():
                 print(f"- {point_name}: {obj.presentValue} ({obj.objectType})")
                 break
 
-    # Define a 24-hour period of outdoor temperatures with a sine wave pattern
-    # Coldest at 5 AM, warmest at 5 PM
-    outdoor_temps = {hour: 65 + 15 * math.sin(math.pi * (hour - 5) / 12) for hour in range(24)}
-
-    # Office occupied from 8 AM to 6 PM
-    occupied_hours = [(8, 18)]
     occupancy = 5  # 5 people during occupied hours
 
     # Simulation start time - 6 AM
@@ -78,11 +85,10 @@ async def run_simulation():
             minute = 0
 
             # Get temperature for current hour
-            outdoor_temp = outdoor_temps[hour]
+            outdoor_temp = OUTDOOR_TEMPS[hour]
 
             # Check if occupied based on time of day
-            is_occupied = any(start <= hour < end for start, end in occupied_hours)
-            occupancy_count = occupancy if is_occupied else 0
+            occupancy_count = occupancy if hour in OCCUPIED_HOURS else 0
 
             # Add some random variation to make it more realistic
             outdoor_temp += random.uniform(-1, 1)  # ±1°F variation
@@ -94,11 +100,8 @@ async def run_simulation():
             vav.update(vav.zone_temp, supply_air_temp)
 
             # Simulate thermal behavior for 1 hour
-            vav_effect = 0
-            if vav.mode == "cooling":
-                vav_effect = vav.current_airflow / vav.max_airflow
-            elif vav.mode == "heating" and vav.has_reheat:
-                vav_effect = -vav.reheat_valve_position
+            mode_effect = MODE_EFFECTS.get(vav.mode)
+            vav_effect = mode_effect(vav) if mode_effect else 0
 
             temp_change = vav.calculate_thermal_behavior(
                 minutes=60,  # 1 hour
@@ -117,8 +120,8 @@ async def run_simulation():
             time_str = f"{hour:02d}:{minute:02d}"
             print(
                 f"Time: {time_str}, Outdoor: {outdoor_temp:.1f}°F, "
-                + f"Zone: {vav.zone_temp:.1f}°F, Mode: {vav.mode}, "
-                + f"Airflow: {vav.current_airflow:.0f} CFM"
+                f"Zone: {vav.zone_temp:.1f}°F, Mode: {vav.mode}, "
+                f"Airflow: {vav.current_airflow:.0f} CFM"
             )
 
             # Move to next hour
@@ -14,9 +14,12 @@ import asyncio
 import math
 import random
 import signal
+import time
 
 from bacpypes3.vlan import VirtualNetwork
 from bacpypes3.app import Application
+from bacpypes3.apdu import ErrorRejectAbortNack
+from bacpypes3.basetypes import ErrorType
 
 from src.vav_box import VAVBox
 
@@ -24,65 +27,95 @@ IP_ADDRESS = "10.88.0.4"
 IP_SUBNET = "/16"
 IP_SUBNET_MASK = "255.255.0.0"
 
+# 24-hour outdoor temperature pattern (sine wave), coldest at 5 AM, warmest at 5 PM
+OUTDOOR_TEMPS = tuple(65 + 15 * math.sin(math.pi * (hour - 5) / 12) for hour in range(24))
+
+# Office occupied from 8 AM to 6 PM
+OCCUPIED_HOURS = frozenset(range(8, 18))
+
+# Thermal-model VAV effect by operating mode: positive for cooling, negative for
+# heating; modes not listed (e.g. deadband) have no effect
+MODE_EFFECTS = {
+    "cooling": lambda vav: vav.current_airflow / vav.max_airflow,
+    "heating": lambda vav: -vav.reheat_valve_position if vav.has_reheat else 0,
+}
+
+# Consecutive failed state reads before the controller re-locates a device
+MAX_READ_FAILURES = 3
+
+# Controller polling backs off to this multiple of the smoothed cycle round-trip time
+POLL_RTT_MULTIPLIER = 3
+POLL_RTT_SMOOTHING = 0.2  # EWMA weight given to the newest cycle
+
+# JSON-compatible configuration for the controller's objects; create_controller
+# fills in the addresses
+CONTROLLER_DEVICE_OBJECT = {
+    "apdu-segment-timeout": 1000,
+    "apdu-timeout": 3000,
+    "object-identifier": "device,1000",
+    "object-name": "BACnet Controller",
+    "object-type": "device",
+    "vendor-identifier": 999,
+    "vendor-name": "HVACNetwork",
+    "model-name": "Controller",
+    "protocol-version": 1,
+    "protocol-revision": 22,
+    "application-software-version": "1.0",
+    "description": "Central BACnet Controller",
+}
+CONTROLLER_IP_PORT = {
+    "bacnet-ip-mode": "normal",
+    "bacnet-ip-udp-port": 47808,
+    "changes-pending": False,
+    "ip-subnet-mask": IP_SUBNET_MASK,
+    "link-speed": 0.0,
+    "network-number": 100,
+    "network-number-quality": "configured",
+    "network-type": "ipv4",
+    "object-identifier": "network-port,1",
+    "object-name": "NetworkPort-1",
+    "object-type": "network-port",
+    "out-of-service": False,
+    "protocol-level": "bacnet-application",
+    "reliability": "no-fault-detected",
+}
+CONTROLLER_VIRTUAL_PORT = {
+    "changes-pending": False,
+    "network-number": 200,
+    "network-number-quality": "configured",
+    "network-type": "virtual",
+    "object-identifier": "network-port,2",
+    "object-name": "NetworkPort-2",
+    "object-type": "network-port",
+    "out-of-service": False,
+    "protocol-level": "bacnet-application",
+    "reliability": "no-fault-detected",
+}
+
 # Global references to keep objects alive
 all_devices = []
 virtual_network = None
 controller_app = None
 exit_event = None
+vav_state_updated = None  # Set by the simulation loop, cleared by the controller monitor
+state_text_cache = {}  # (device address, object id) -> state-text, which never changes
 app: Application
 
 
-async def create_controller(network_name, mac_address="0x01"):
+async def create_controller(network_name, mac_address="0x02"):
     """Create a controller device that can interact with the VAV boxes."""
-    # Create JSON-compatible configuration for the controller
+    # Static controller objects with this call's addresses filled in
     controller_config = [
-        # Device Object
-        {
-            "apdu-segment-timeout": 1000,
-            "apdu-timeout": 3000,
-            "object-identifier": "device,1000",
-            "object-name": "BACnet Controller",
-            "object-type": "device",
-            "vendor-identifier": 999,
-            "vendor-name": "HVACNetwork",
-            "model-name": "Controller",
-            "protocol-version": 1,
-            "protocol-revision": 22,
-            "application-software-version": "1.0",
-            "description": "Central BACnet Controller",
-        },
+        CONTROLLER_DEVICE_OBJECT,
         {
-            "bacnet-ip-mode": "normal",
-            "bacnet-ip-udp-port": 47808,
-            "changes-pending": False,
+            **CONTROLLER_IP_PORT,
             "ip-address": IP_ADDRESS,
-            "ip-subnet-mask": IP_SUBNET_MASK,
-            "link-speed": 0.0,
             "mac-address": f"{IP_ADDRESS}:47808",
-            "network-number": 100,
-            "network-number-quality": "configured",
-            "network-type": "ipv4",
-            "object-identifier": "network-port,1",
-            "object-name": "NetworkPort-1",
-            "object-type": "network-port",
-            "out-of-service": False,
-            "protocol-level": "bacnet-application",
-            "reliability": "no-fault-detected",
         },
-        # Network Port
         {
-            "changes-pending": False,
-            "mac-address": "0x02",
-            "network-interface-name": "hvac-network",
-            "network-number": 200,
-            "network-number-quality": "configured",
-            "network-type": "virtual",
-            "object-identifier": "network-port,2",
-            "object-name": "NetworkPort-2",
-            "object-type": "network-port",
-            "out-of-service": False,
-            "protocol-level": "bacnet-application",
-            "reliability": "no-fault-detected",
+            **CONTROLLER_VIRTUAL_PORT,
+            "mac-address": mac_address,
+            "network-interface-name": network_name,
         },
     ]
 
@@ -107,22 +140,8 @@ async def discover_devices(controller_app):
     return i_ams
 
 
-async def read_vav_properties(
-    controller_app, device_address, object_id, property_id="present-value"
-):
-    """Read a property from a VAV device."""
-    try:
-        result = await controller_app.read_property(
-            address=device_address, objid=object_id, prop=property_id
-        )
-        return result
-    except Exception as e:
-        print(f"Error reading property: {e}")
-        return None
-
-
 async def read_vav_state(controller_app, i_am):
-    """Read the state of a VAV device."""
+    """Read the state of a VAV device with a single ReadPropertyMultiple request."""
     device_id = i_am.iAmDeviceIdentifier[1]
     device_address = i_am.pduSource
 
@@ -136,51 +155,145 @@ async def read_vav_state(controller_app, i_am):
 
     print(f"\nReading state of device {device_id}:")
 
+    # One request for every present-value, plus state-text for multi-state points
+    # the first time they are read from this device
+    address_key = str(device_address)
+    parameter_list = []
+    for obj_id, _ in properties:
+        parameter_list.append(obj_id)
+        if obj_id.startswith("multi-state") and (address_key, obj_id) not in state_text_cache:
+            parameter_list.append(["present-value", "state-text"])
+        else:
+            parameter_list.append(["present-value"])
+
+    try:
+        response = await controller_app.read_property_multiple(
+            address=device_address, parameter_list=parameter_list
+        )
+    except Exception as e:
+        print(f"Error reading properties from {device_address}: {e}")
+        return {}
+
+    # bacpypes3 returns None for an unexpected (non-ACK) response
+    if response is None or isinstance(response, ErrorRejectAbortNack):
+        print(f"Error reading properties from {device_address}: {response}")
+        return {}
+
+    values = {(str(obj_id), str(prop_id)): value for obj_id, prop_id, _, value in response}
+
     state = {}
     for obj_id, name in properties:
-        try:
-            value = await read_vav_properties(controller_app, device_address, obj_id)
-
-            # For multi-state values, try to read state-text and convert numeric value to text
-            if obj_id.startswith("multi-state"):
-                try:
-                    state_text = await read_vav_properties(
-                        controller_app, device_address, obj_id, "state-text"
-                    )
-                    if state_text and 1 <= value <= len(state_text):
-                        value = f"{value} ({state_text[value-1]})"
-                except Exception:
-                    pass
-
-            state[name] = value
-            print(f"  {name}: {value}")
-        except:
+        value = values.get((obj_id, "present-value"))
+        if value is None or isinstance(value, ErrorType):
             print(f"Error reading property: {device_address} - {obj_id} - {name}")
+            continue
+
+        # For multi-state values, convert the numeric value to its state text
+        state_text = values.get((obj_id, "state-text"))
+        if state_text is not None and not isinstance(state_text, ErrorType):
+            state_text_cache[address_key, obj_id] = state_text
+        else:
+            state_text = state_text_cache.get((address_key, obj_id))
+        if state_text and 1 <= value <= len(state_text):
+            value = f"{value} ({state_text[value - 1]})"
+
+        state[name] = value
+        print(f"  {name}: {value}")
 
     return state
 
 
-async def simulate_vav_box(vav, app, hours_per_minute=60):
-    """Maintain an ongoing simulation of a VAV box, updating when requested.
+async def wait_for_exit(timeout):
+    """Sleep for up to timeout seconds, returning early if shutdown is signalled."""
+    try:
+        await asyncio.wait_for(exit_event.wait(), timeout=timeout)
+    except TimeoutError:
+        pass
+
+
+def step_vav_box(vav, outdoor_temp, occupancy_count, supply_air_temp, minutes_elapsed, time_of_day):
+    """Advance one VAV box's controls and zone temperature by one simulation step.
 
     Args:
         vav: VAVBox instance to simulate
-        app: BACpypes3 Application object
-        hours_per_minute: Speed factor for simulation time
+        outdoor_temp: Outdoor air temperature (°F)
+        occupancy_count: Number of occupants in the zone
+        supply_air_temp: AHU supply air temperature (°F)
+        minutes_elapsed: Simulated minutes since the previous step
+        time_of_day: (hour, minute) tuple for the current simulation time
     """
-    # Define a 24-hour period of outdoor temperatures with a sine wave pattern
-    # Coldest at 5 AM, warmest at 5 PM
-    outdoor_temps = {hour: 65 + 15 * math.sin(math.pi * (hour - 5) / 12) for hour in range(24)}
+    # Set occupancy
+    vav.set_occupancy(occupancy_count)
 
-    # Office occupied from 8 AM to 6 PM
-    occupied_hours = [(8, 18)]
-    occupancy = 5  # 5 people during occupied hours
+    # Only reset if temperature is truly unrealistic
+    if vav.zone_temp < 20 or vav.zone_temp > 120:
+        print(f"Resetting unrealistic temperature: {vav.zone_temp:.1f}°F to setpoint")
+        vav.zone_temp = vav.zone_temp_setpoint
 
-    # Simulation start time - 6 AM
-    start_hour = 6
+    # Update VAV box with current conditions
+    vav.update(vav.zone_temp, supply_air_temp)
+
+    # Simulate thermal behavior for the time elapsed since last update
+    mode_effect = MODE_EFFECTS.get(vav.mode)
+    vav_effect = mode_effect(vav) if mode_effect else 0
+
+    temp_change = vav.calculate_thermal_behavior(
+        minutes=minutes_elapsed,
+        outdoor_temp=outdoor_temp,
+        vav_cooling_effect=vav_effect,
+        time_of_day=time_of_day,
+    )
+
+    # Our thermal model now handles rate-of-change limits internally
+    # This is now redundant, but we'll keep a more generous limit as a safety check
+    max_allowed_change = 5.0  # Maximum 5°F change per step to prevent simulation errors
+    temp_change = max(min(temp_change, max_allowed_change), -max_allowed_change)
+
+    # Update zone temperature with calculated change (scaled by elapsed time)
+    vav.zone_temp += temp_change
+
+
+def sim_clock(start_hour=6, tick_minutes=15):
+    """Yield the simulation time and schedule for each step, starting at start_hour.
+
+    Yields:
+        (hour, minute, minutes_elapsed, is_occupied) tuples, where minutes_elapsed
+        is the simulated time since the previous step: 1 for the first step, then
+        tick_minutes (capped at 60 to avoid large temperature jumps)
+    """
     current_hour = start_hour
     current_minute = 0
-    previous_time = (current_hour, current_minute)
+    minutes_elapsed = 1  # Nothing has elapsed yet; simulate at least 1 minute
+    step_minutes = min(tick_minutes, 60)
+
+    while True:
+        # Get current simulation hour (wrapped to 0-23)
+        hour = current_hour % 24
+        yield hour, current_minute, minutes_elapsed, hour in OCCUPIED_HOURS
+
+        # Advance the clock to the next simulation step
+        minutes_elapsed = step_minutes
+        current_minute += tick_minutes
+        current_hour += current_minute // 60
+        current_minute %= 60
+
+
+async def simulate_vav_boxes(vav_devices, hours_per_minute=60):
+    """Run all VAV boxes on one shared simulation clock.
+
+    Each tick steps every VAV box's thermal model, then pushes all of the
+    BACnet device updates concurrently.
+
+    Args:
+        vav_devices: List of (VAVBox, BACpypes3 Application) pairs to simulate
+        hours_per_minute: Speed factor for simulation time
+    """
+    occupancy = 5  # 5 people during occupied hours
+
+    # Simulation start time - 6 AM, in 15-minute steps
+    start_hour = 6
+    clock = sim_clock(start_hour, tick_minutes=15)
+    hour, minute = start_hour, 0
 
     # Constant AHU supply air temperature
     supply_air_temp = 55  # °F
@@ -188,114 +301,82 @@ async def simulate_vav_box(vav, app, hours_per_minute=60):
     # Calculate sleep time for simulation speed
     sleep_time = 60 / hours_per_minute  # seconds per simulated hour
 
-    print(f"\nStarting simulation for VAV box {vav.name}...")
+    names = ", ".join(vav.name for vav, _ in vav_devices)
+    print(f"\nStarting simulation for VAV boxes {names}...")
     print(f"Speed: {hours_per_minute}x (1 hour per {sleep_time:.1f} seconds)")
 
     try:
         while not exit_event.is_set():
-            # Get current simulation hour (wrapped to 0-23)
-            hour = current_hour % 24
-            minute = current_minute
-
-            # Get temperature for current hour
-            outdoor_temp = outdoor_temps[hour]
-
-            # Add some random variation to make it more realistic
-            outdoor_temp += random.uniform(-1, 1)  # ±1°F variation
-
-            # Check if occupied based on time of day
-            is_occupied = any(start <= hour < end for start, end in occupied_hours)
+            hour, minute, minutes_elapsed, is_occupied = next(clock)
             occupancy_count = occupancy if is_occupied else 0
 
-            # Set occupancy
-            vav.set_occupancy(occupancy_count)
-
-            # Only reset if temperature is truly unrealistic
-            if vav.zone_temp < 20 or vav.zone_temp > 120:
-                print(f"Resetting unrealistic temperature: {vav.zone_temp:.1f}°F to setpoint")
-                vav.zone_temp = vav.zone_temp_setpoint
-
-            # Update VAV box with current conditions
-            vav.update(vav.zone_temp, supply_air_temp)
-
-            # Simulate thermal behavior for the time elapsed since last update
-            vav_effect = 0
-            if vav.mode == "cooling":
-                vav_effect = (
-                    vav.current_airflow / vav.max_airflow
-                )  # Positive effect for cooling in our thermal model
-            elif vav.mode == "heating" and vav.has_reheat:
-                vav_effect = (
-                    -vav.reheat_valve_position
-                )  # Negative effect for heating in our thermal model
-
-            # Calculate minutes elapsed since last update
-            prev_hour, prev_minute = previous_time
-            minutes_elapsed = ((hour - prev_hour) % 24) * 60 + (minute - prev_minute)
-            if minutes_elapsed <= 0:
-                minutes_elapsed = 1  # Ensure at least 1 minute of simulation
-
-            # Cap the maximum simulation step to avoid large temperature jumps
-            minutes_elapsed = min(minutes_elapsed, 60)
-
-            temp_change = vav.calculate_thermal_behavior(
-                minutes=minutes_elapsed,
-                outdoor_temp=outdoor_temp,
-                vav_cooling_effect=vav_effect,
-                time_of_day=(hour, minute),
-            )
-
-            # Our thermal model now handles rate-of-change limits internally
-            # This is now redundant, but we'll keep a more generous limit as a safety check
-            max_allowed_change = 5.0  # Maximum 5°F change per step to prevent simulation errors
-            temp_change = max(min(temp_change, max_allowed_change), -max_allowed_change)
-
-            # Update zone temperature with calculated change (scaled by elapsed time)
-            vav.zone_temp += temp_change
-
-            # Our thermal model now naturally prevents extreme temperatures
-            # No artificial clamping needed
-
-            # Save current time for next update
-            previous_time = (hour, minute)
-
-            # Update the BACnet device
-            await vav.update_bacpypes3_device(app)
-
-            # Display current simulation time and key values
+            outdoor_temps = []
+            for vav, _ in vav_devices:
+                # Add some random variation to make it more realistic
+                outdoor_temp = OUTDOOR_TEMPS[hour] + random.uniform(-1, 1)  # ±1°F variation
+                outdoor_temps.append(outdoor_temp)
+                step_vav_box(
+                    vav,
+                    outdoor_temp,
+                    occupancy_count,
+                    supply_air_temp,
+                    minutes_elapsed,
+                    (hour, minute),
+                )
+
+            # Update all BACnet devices concurrently
+            await asyncio.gather(*(vav.update_bacpypes3_device(app) for vav, app in vav_devices))
+            vav_state_updated.set()
+
+            # Display current simulation time and key values, one write per tick
             time_str = f"{hour:02d}:{minute:02d}"
             print(
-                f"{vav.name} - Time: {time_str}, Outdoor: {outdoor_temp:.1f}°F, "
-                + f"Zone: {vav.zone_temp:.1f}°F, Mode: {vav.mode}, "
-                + f"Airflow: {vav.current_airflow:.0f} CFM"
+                "\n".join(
+                    f"{vav.name} - Time: {time_str}, Outdoor: {outdoor_temp:.1f}°F, "
+                    f"Zone: {vav.zone_temp:.1f}°F, Mode: {vav.mode}, "
+                    f"Airflow: {vav.current_airflow:.0f} CFM"
+                    for (vav, _), outdoor_temp in zip(vav_devices, outdoor_temps)
+                )
             )
 
-            # Increment time by a small amount for the next simulation step
-            current_minute += 15  # 15-minute increments
-            if current_minute >= 60:
-                current_hour += 1
-                current_minute = 0
-
             # Sleep for the appropriate time to maintain simulation speed
-            await asyncio.sleep(sleep_time / 4)  # Quarter of an hour in sim time
+            await wait_for_exit(sleep_time / 4)  # Quarter of an hour in sim time
 
     except asyncio.CancelledError:
-        print(f"\nSimulation for {vav.name} cancelled.")
+        print("\nVAV simulation cancelled.")
     except Exception as e:
-        print(f"\nError in {vav.name} simulation: {e}")
+        print(f"\nError in VAV simulation: {e}")
     finally:
-        print(f"Simulation for {vav.name} stopped at {hour:02d}:{minute:02d}.")
+        print(f"VAV simulation stopped at {hour:02d}:{minute:02d}.")
+
+
+async def rediscover_device(controller_app, device_id):
+    """Send a Who-Is targeted at a single device and return its I-Am, or None."""
+    print(f"\nRediscovering device {device_id}...")
+    i_ams = await controller_app.who_is(low_limit=device_id, high_limit=device_id)
+    return i_ams[0] if i_ams else None
 
 
 async def controller_monitoring(controller_app, monitoring_interval=5):
-    """Periodically monitor VAV devices from the controller."""
-    try:
-        discovered_devices = []
+    """Periodically monitor VAV devices from the controller.
+
+    A monitoring cycle is skipped when no simulation tick has updated the VAV
+    devices since the previous one. Devices are discovered once with a
+    broadcast Who-Is and then cached. A device is only looked up again, with a
+    Who-Is targeted at its device ID, after MAX_READ_FAILURES consecutive
+    failed state reads.
 
+    The wait between cycles is monitoring_interval, or POLL_RTT_MULTIPLIER times
+    the smoothed duration of recent read cycles if that is longer, so a slow or
+    congested network is polled less often.
+    """
+    rtt_avg = 0.0
+    try:
         # Initial discovery
         print("\nInitial device discovery...")
         i_ams = await discover_devices(controller_app)
-        discovered_devices = i_ams
+        discovered_devices = {i_am.iAmDeviceIdentifier[1]: i_am for i_am in i_ams}
+        read_failures = dict.fromkeys(discovered_devices, 0)
 
         # Initial state reading
         if i_ams:
@@ -305,24 +386,35 @@ async def controller_monitoring(controller_app, monitoring_interval=5):
 
         # Periodic monitoring
         while not exit_event.is_set():
-            try:
-                # Every interval, read the latest state from each device
-                print("\n--- Controller Monitoring Update ---")
+            # Only poll when a simulation tick has pushed new values since the last read
+            if vav_state_updated.is_set():
+                vav_state_updated.clear()
+                cycle_start = time.perf_counter()
+                try:
+                    print("\n--- Controller Monitoring Update ---")
 
-                # Re-discover devices occasionally to catch any changes
-                if random.random() < 0.2:  # 20% chance to rediscover
-                    i_ams = await discover_devices(controller_app)
-                    discovered_devices = i_ams
+                    # Read state from each known device
+                    for device_id, i_am in discovered_devices.items():
+                        if await read_vav_state(controller_app, i_am):
+                            read_failures[device_id] = 0
+                            continue
 
-                # Read state from each known device
-                for i_am in discovered_devices:
-                    await read_vav_state(controller_app, i_am)
+                        read_failures[device_id] += 1
+                        if read_failures[device_id] >= MAX_READ_FAILURES:
+                            # The device may have moved; refresh its address
+                            i_am = await rediscover_device(controller_app, device_id)
+                            if i_am is not None:
+                                discovered_devices[device_id] = i_am
+                            read_failures[device_id] = 0
 
-            except Exception as e:
-                print(f"Controller monitoring error: {e}")
+                except Exception as e:
+                    print(f"Controller monitoring error: {e}")
+
+                cycle_time = time.perf_counter() - cycle_start
+                rtt_avg += POLL_RTT_SMOOTHING * (cycle_time - rtt_avg)
 
             # Wait before next monitoring cycle
-            await asyncio.sleep(monitoring_interval)
+            await wait_for_exit(max(monitoring_interval, POLL_RTT_MULTIPLIER * rtt_avg))
 
     except asyncio.CancelledError:
         print("\nController monitoring cancelled.")
@@ -333,15 +425,16 @@ async def controller_monitoring(controller_app, monitoring_interval=5):
 
 
 async def main():
-    global all_devices, virtual_network, controller_app, exit_event
+    global all_devices, virtual_network, controller_app, exit_event, vav_state_updated
 
     # Create an exit event for clean shutdown
     exit_event = asyncio.Event()
+    vav_state_updated = asyncio.Event()
 
-    # Set up signal handlers for graceful shutdown
+    # Signals only stop the loops; shutdown() runs once when main() unwinds
     loop = asyncio.get_running_loop()
     for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, lambda: asyncio.create_task(shutdown()))
+        loop.add_signal_handler(sig, exit_event.set)
 
     try:
         # Create a virtual network
@@ -423,7 +516,7 @@ async def main():
                 network_interface_name=network_name,
                 mac_address=mac_address,
             )
-            await asyncio.sleep(0.1)
+
             # Store for simulation
             vav_devices.append((vav, app))
             all_devices.append(app)  # Keep reference for cleanup
@@ -431,20 +524,11 @@ async def main():
         # Discover devices on the network
         # await discover_devices(controller_app)
 
-        # Start simulations for each VAV box
-        simulation_tasks = []
-        for vav, app in vav_devices:
-            simulation_tasks.append(
-                asyncio.create_task(simulate_vav_box(vav, app, hours_per_minute=60))
-            )
-
-        # Start controller monitoring
-        monitoring_task = asyncio.create_task(
-            controller_monitoring(controller_app, monitoring_interval=10)
-        )
-
-        # Wait for all tasks to complete
-        await asyncio.gather(*simulation_tasks, monitoring_task)
+        # Run the simulation loop and controller monitoring until both finish; if
+        # either fails, the task group cancels the other before re-raising
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(simulate_vav_boxes(vav_devices, hours_per_minute=60))
+            tg.create_task(controller_monitoring(controller_app, monitoring_interval=10))
 
     except Exception as e:
         import traceback
@@ -461,8 +545,8 @@ async def shutdown():
     global exit_event, all_devices
 
     # Signal all tasks to exit
-    if exit_event and not exit_event.is_set():
-        print("\nShutting down...")
+    print("\nShutting down...")
+    if exit_event:
         exit_event.set()
 
     # Close all devices - BACpypes3 Application objects don't need explicit closing
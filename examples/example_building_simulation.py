@@ -4,15 +4,89 @@ Example simulation demonstrating a complete building with multiple AHUs and zone
 This simulates a small office building over a 24-hour period.
 """
 
-import math
-from datetime import datetime, timedelta
+from datetime import datetime
+import matplotlib
+
+matplotlib.use("Agg")  # Only writes a PNG; skip interactive backend setup
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import numpy as np
 from src.vav_box import VAVBox
 from src.ahu import AirHandlingUnit
 from src.building import Building
 
 
+# Time axis tick labels and spacing (hours). The locator and formatter objects
+# themselves are made per plot: matplotlib binds each one to a single axis.
+TIME_AXIS_FORMAT = "%H:%M"
+TIME_AXIS_HOURS = 2
+
+# Settings shared by every zone's VAV box
+ZONE_DEFAULTS = {"deadband": 2, "discharge_air_temp_setpoint": 55}
+
+# Per-zone VAV box settings, grouped by the floor (and AHU) that serves them
+FLOOR1_ZONES = (
+    {
+        "name": "Floor1_Office",
+        "min_airflow": 300,
+        "max_airflow": 2000,
+        "zone_temp_setpoint": 72,
+        "has_reheat": True,
+        "zone_area": 6000,
+        "zone_volume": 48000,
+        "window_area": 800,
+        "window_orientation": "south",
+    },
+    {
+        "name": "Floor1_Conference",
+        "min_airflow": 400,
+        "max_airflow": 2500,
+        "zone_temp_setpoint": 70,
+        "has_reheat": True,
+        "zone_area": 1500,
+        "zone_volume": 12000,
+        "window_area": 200,
+        "window_orientation": "east",
+    },
+    {
+        "name": "Floor1_Lobby",
+        "min_airflow": 500,
+        "max_airflow": 3000,
+        "zone_temp_setpoint": 74,
+        "has_reheat": False,
+        "zone_area": 1000,
+        "zone_volume": 8000,
+        "window_area": 400,
+        "window_orientation": "north",
+    },
+)
+
+FLOOR2_ZONES = (
+    {
+        "name": "Floor2_Office",
+        "min_airflow": 300,
+        "max_airflow": 2000,
+        "zone_temp_setpoint": 72,
+        "has_reheat": True,
+        "zone_area": 8000,
+        "zone_volume": 64000,
+        "window_area": 1000,
+        "window_orientation": "south",
+    },
+    {
+        "name": "Floor2_Conference",
+        "min_airflow": 400,
+        "max_airflow": 2500,
+        "zone_temp_setpoint": 70,
+        "has_reheat": True,
+        "zone_area": 2000,
+        "zone_volume": 16000,
+        "window_area": 250,
+        "window_orientation": "west",
+    },
+)
+
+
 def main():
     """Run a whole-building simulation."""
     # Create the building
@@ -28,84 +102,13 @@ def main():
         timezone="America/New_York",
     )
 
-    # Create VAV boxes for different zones - Floor 1
-    floor1_office = VAVBox(
-        name="Floor1_Office",
-        min_airflow=300,
-        max_airflow=2000,
-        zone_temp_setpoint=72,
-        deadband=2,
-        discharge_air_temp_setpoint=55,
-        has_reheat=True,
-        zone_area=6000,
-        zone_volume=48000,
-        window_area=800,
-        window_orientation="south",
-    )
-
-    floor1_conference = VAVBox(
-        name="Floor1_Conference",
-        min_airflow=400,
-        max_airflow=2500,
-        zone_temp_setpoint=70,
-        deadband=2,
-        discharge_air_temp_setpoint=55,
-        has_reheat=True,
-        zone_area=1500,
-        zone_volume=12000,
-        window_area=200,
-        window_orientation="east",
-    )
-
-    floor1_lobby = VAVBox(
-        name="Floor1_Lobby",
-        min_airflow=500,
-        max_airflow=3000,
-        zone_temp_setpoint=74,
-        deadband=2,
-        discharge_air_temp_setpoint=55,
-        has_reheat=False,
-        zone_area=1000,
-        zone_volume=8000,
-        window_area=400,
-        window_orientation="north",
-    )
-
-    # Create VAV boxes for different zones - Floor 2
-    floor2_office = VAVBox(
-        name="Floor2_Office",
-        min_airflow=300,
-        max_airflow=2000,
-        zone_temp_setpoint=72,
-        deadband=2,
-        discharge_air_temp_setpoint=55,
-        has_reheat=True,
-        zone_area=8000,
-        zone_volume=64000,
-        window_area=1000,
-        window_orientation="south",
-    )
-
-    floor2_conference = VAVBox(
-        name="Floor2_Conference",
-        min_airflow=400,
-        max_airflow=2500,
-        zone_temp_setpoint=70,
-        deadband=2,
-        discharge_air_temp_setpoint=55,
-        has_reheat=True,
-        zone_area=2000,
-        zone_volume=16000,
-        window_area=250,
-        window_orientation="west",
-    )
+    # Create VAV boxes for different zones
+    floor1_zones = [VAVBox(**ZONE_DEFAULTS, **zone) for zone in FLOOR1_ZONES]
+    floor2_zones = [VAVBox(**ZONE_DEFAULTS, **zone) for zone in FLOOR2_ZONES]
 
     # Add all zones to the building
-    building.add_zone(floor1_office)
-    building.add_zone(floor1_conference)
-    building.add_zone(floor1_lobby)
-    building.add_zone(floor2_office)
-    building.add_zone(floor2_conference)
+    for zone in floor1_zones + floor2_zones:
+        building.add_zone(zone)
 
     # Create Air Handling Units
     ahu1 = AirHandlingUnit(
@@ -115,7 +118,7 @@ def main():
         min_supply_air_temp=52,
         max_supply_air_temp=65,
         max_supply_airflow=7500,
-        vav_boxes=[floor1_office, floor1_conference, floor1_lobby],
+        vav_boxes=floor1_zones,
         enable_supply_temp_reset=True,
     )
 
@@ -126,7 +129,7 @@ def main():
         min_supply_air_temp=52,
         max_supply_air_temp=65,
         max_supply_airflow=4500,
-        vav_boxes=[floor2_office, floor2_conference],
+        vav_boxes=floor2_zones,
         enable_supply_temp_reset=True,
         compressor_stages=3,
     )
@@ -139,13 +142,7 @@ def main():
     weather_data = generate_weather_data()
 
     # Set initial zone temperatures
-    initial_temps = {
-        "Floor1_Office": 72,
-        "Floor1_Conference": 72,
-        "Floor1_Lobby": 72,
-        "Floor2_Office": 72,
-        "Floor2_Conference": 72,
-    }
+    initial_temps = {zone.name: 72 for zone in floor1_zones + floor2_zones}
 
     # Run the simulation
     print("Running 24-hour building simulation...")
@@ -165,63 +162,101 @@ def main():
 
 def generate_weather_data():
     """Generate synthetic weather data for a 24-hour period."""
-    weather_data = []
-
     # Start time (midnight)
     start_time = datetime(2023, 7, 15, 0, 0)
 
     # Generate data for each 15-minute interval (96 points)
-    for i in range(96):
-        # Current time
-        current_time = start_time + timedelta(minutes=15 * i)
-        hour = current_time.hour + current_time.minute / 60
-
-        # Outdoor temperature model (lowest at 5am, highest at 3pm)
-        temp = 65 + 20 * math.sin(math.pi * (hour - 5) / 12)
-
-        # Humidity model (highest at night/morning, lowest in afternoon)
-        humidity = 70 - 30 * math.sin(math.pi * (hour - 5) / 12)
-
-        # Solar radiation (0 at night, peak at noon)
-        if 6 <= hour <= 18:
-            solar_factor = math.sin(math.pi * (hour - 6) / 12)
-            solar_ghi = 1000 * solar_factor
-        else:
-            solar_ghi = 0
-
-        # Create weather data point
-        data_point = {
-            "time": current_time,
-            "temperature": temp,
-            "humidity": humidity,
-            "solar_ghi": solar_ghi,
-            "wind_speed": 5 + 3 * math.sin(hour / 24 * 2 * math.pi),
-            "wind_direction": (hour / 24 * 360) % 360,  # Wind direction changes throughout the day
-        }
-
-        weather_data.append(data_point)
+    steps = np.arange(96)
+    hour = steps * 0.25
+    times = (np.datetime64(start_time, "m") + steps * np.timedelta64(15, "m")).tolist()
+
+    # All sine terms in one vectorized call: the daily temperature/humidity cycle,
+    # the solar arc and the wind cycle
+    daily_cycle, solar_arc, wind_cycle = np.sin(
+        np.stack([np.pi * (hour - 5) / 12, np.pi * (hour - 6) / 12, hour / 24 * 2 * np.pi])
+    )
 
-    return weather_data
+    # Outdoor temperature (lowest at 5am, highest at 3pm) and humidity (highest at
+    # night/morning, lowest in afternoon) share the same daily cycle
+    temp = 65 + 20 * daily_cycle
+    humidity = 70 - 30 * daily_cycle
+
+    # Solar radiation (0 at night, peak at noon)
+    daylight = (hour >= 6) & (hour <= 18)
+    solar_ghi = np.where(daylight, 1000 * solar_arc, 0.0)
+
+    wind_speed = 5 + 3 * wind_cycle
+    wind_direction = (hour / 24 * 360) % 360  # Wind direction changes throughout the day
+
+    return [
+        {
+            "time": time,
+            "temperature": t,
+            "humidity": h,
+            "solar_ghi": ghi,
+            "wind_speed": ws,
+            "wind_direction": wd,
+        }
+        for time, t, h, ghi, ws, wd in zip(
+            times,
+            temp.tolist(),
+            humidity.tolist(),
+            solar_ghi.tolist(),
+            wind_speed.tolist(),
+            wind_direction.tolist(),
+        )
+    ]
+
+
+def results_to_arrays(results):
+    """Convert per-timestep simulation results into one array per series.
+
+    Returns:
+        Dictionary with "time" (datetime64 array), "outdoor_temp", "zone_temps"
+        (zone name -> array) and "cooling_energy", "heating_energy", "fan_energy"
+        arrays in kBTU/hr
+    """
+    steps = len(results)
+    # datetime64 lets matplotlib convert the whole time axis at once per plot call
+    times = np.empty(steps, dtype="datetime64[m]")
+    outdoor_temp = np.empty(steps)
+    zone_temps = {name: np.empty(steps) for name in results[0]["zone_temps"]}
+    cooling_energy = np.empty(steps)
+    heating_energy = np.empty(steps)
+    fan_energy = np.empty(steps)
+
+    # Single pass over the results, filling every series at once
+    for i, result in enumerate(results):
+        times[i] = result["time"]
+        outdoor_temp[i] = result["outdoor_temp"]
+        for name, temp in result["zone_temps"].items():
+            zone_temps[name][i] = temp
+        energy = result["energy"]
+        cooling_energy[i] = energy["cooling"]
+        heating_energy[i] = energy["heating"]
+        fan_energy[i] = energy["fan"]
+
+    return {
+        "time": times,
+        "outdoor_temp": outdoor_temp,
+        "zone_temps": zone_temps,
+        "cooling_energy": cooling_energy / 1000,
+        "heating_energy": heating_energy / 1000,
+        "fan_energy": fan_energy / 1000,
+    }
 
 
 def plot_results(results, report):
     """Plot building simulation results."""
-    # Convert times to datetime objects for better plotting
-    times = [result["time"] for result in results]
-
-    # Extract data
-    outdoor_temps = [result["outdoor_temp"] for result in results]
+    series = results_to_arrays(results)
+    times = series["time"]
+    outdoor_temps = series["outdoor_temp"]
+    zone_temps = series["zone_temps"]
 
-    # Zone temperatures
-    zone_names = list(results[0]["zone_temps"].keys())
-    zone_temps = {name: [result["zone_temps"][name] for result in results] for name in zone_names}
-
-    # Energy data for each timestep
-    cooling_energy = [
-        result["energy"]["cooling"] / 1000 for result in results
-    ]  # Convert to kBTU/hr
-    heating_energy = [result["energy"]["heating"] / 1000 for result in results]
-    fan_energy = [result["energy"]["fan"] / 1000 for result in results]
+    # Energy data for each timestep (kBTU/hr)
+    cooling_energy = series["cooling_energy"]
+    heating_energy = series["heating_energy"]
+    fan_energy = series["fan_energy"]
 
     # Create figure
     fig, axs = plt.subplots(3, 1, figsize=(12, 14), sharex=True)
@@ -232,8 +267,8 @@ def plot_results(results, report):
 
     # Plot zone temperatures with different colors
     colors = ["r", "g", "b", "m", "c"]
-    for i, name in enumerate(zone_names):
-        ax1.plot(times, zone_temps[name], f"{colors[i%len(colors)]}-", label=f"{name}")
+    for i, (name, temps) in enumerate(zone_temps.items()):
+        ax1.plot(times, temps, f"{colors[i % len(colors)]}-", label=f"{name}")
 
     # Add setpoint reference
     ax1.axhline(y=72, color="gray", linestyle=":", label="Primary Setpoint (72°F)")
@@ -244,8 +279,8 @@ def plot_results(results, report):
     ax1.grid(True)
 
     # Format x-axis
-    ax1.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-    ax1.xaxis.set_major_locator(mdates.HourLocator(interval=2))
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter(TIME_AXIS_FORMAT))
+    ax1.xaxis.set_major_locator(mdates.HourLocator(interval=TIME_AXIS_HOURS))
 
     # Plot 2: Energy Usage
     ax2 = axs[1]
@@ -254,7 +289,7 @@ def plot_results(results, report):
     ax2.plot(times, fan_energy, "g-", label="Fan Energy")
 
     # Total energy
-    total_energy = [c + h + f for c, h, f in zip(cooling_energy, heating_energy, fan_energy)]
+    total_energy = cooling_energy + heating_energy + fan_energy
     ax2.plot(times, total_energy, "k--", label="Total Energy")
 
     ax2.set_ylabel("Energy (kBTU/hr)")
@@ -278,9 +313,8 @@ def plot_results(results, report):
     ax3.set_xticklabels(ahu_names)
 
     # Add percentage labels
-    total = sum(values)
-    for i, v in enumerate(values):
-        ax3.text(i, v + 0.1, f"{v/total*100:.1f}%", ha="center", fontsize=9)
+    percents = np.asarray(values) * (100 / sum(values))
+    ax3.bar_label(bars, labels=[f"{p:.1f}%" for p in percents], padding=3, fontsize=9)
 
     ax3.set_xlabel("Equipment")
     ax3.set_ylabel("Energy (kBTU)")
@@ -288,7 +322,8 @@ def plot_results(results, report):
     ax3.grid(True, axis="y")
 
     plt.tight_layout()
-    plt.savefig("building_simulation_results.png")
+    plt.savefig("building_simulation_results.png", dpi=100)
+    plt.close(fig)
     print("Simulation results saved to building_simulation_results.png")
 
 
@@ -296,15 +331,15 @@ def print_summary(report):
     """Print energy report summary."""
     print("\nBuilding Energy Summary:")
     print(f"Total Energy: {report['total_energy']/1000:.1f} kBTU")
+    # Share of the building total contributed by each BTU
+    pct_per_btu = 100 / report["total_energy"]
     print("\nEnergy by Type:")
     for energy_type, value in report["energy_by_type"].items():
-        print(
-            f"  {energy_type.capitalize()}: {value/1000:.1f} kBTU ({value/report['total_energy']*100:.1f}%)"
-        )
+        print(f"  {energy_type.capitalize()}: {value/1000:.1f} kBTU ({value*pct_per_btu:.1f}%)")
 
     print("\nEnergy by Equipment:")
     for equipment, value in report["energy_by_equipment"].items():
-        print(f"  {equipment}: {value/1000:.1f} kBTU ({value/report['total_energy']*100:.1f}%)")
+        print(f"  {equipment}: {value/1000:.1f} kBTU ({value*pct_per_btu:.1f}%)")
 
     print(f"\nPeak Demand: {report['peak_demand']/1000:.1f} kBTU/hr")
 
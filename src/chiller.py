@@ -187,6 +187,13 @@ class Chiller(BACPypesApplicationMixin):
         # Calculate performance at these conditions
         self._calculate_performance(limited_load)
 
+    def set_idle(self) -> None:
+        """Turn the chiller off: no load, no flow and zero COP (so zero power)."""
+        self.current_load = 0.0
+        self.current_cop = 0.0
+        self.chilled_water_flow = 0.0
+        self.condenser_water_flow = 0.0
+
     def set_leaving_water_temp_setpoint(self, setpoint: float) -> None:
         """Set leaving chilled water temperature setpoint."""
         # Store old setpoint for COP calculation adjustment
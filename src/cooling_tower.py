@@ -147,6 +147,26 @@ class CoolingTower(BACPypesApplicationMixin):
         if auto_adjust_fan:
             self._adjust_fan_speed()
 
+    def set_idle(self, ambient_wet_bulb: float | None = None) -> None:
+        """
+        Turn the tower off: no heat rejection load, no water flow and fans stopped.
+
+        With nothing flowing, the basin water settles at the ambient wet bulb, so the
+        approach and range drop to zero instead of keeping their last loaded values.
+
+        Args:
+            ambient_wet_bulb: Ambient wet bulb temperature in °F (default: the last
+                reported wet bulb)
+        """
+        if ambient_wet_bulb is not None:
+            self.current_wet_bulb = ambient_wet_bulb
+        self.current_load = 0.0
+        self.water_flow = 0.0
+        self.fan_speed = 0.0
+        self.entering_water_temp = self.current_wet_bulb
+        self.leaving_water_temp = self.current_wet_bulb
+        self.current_approach = 0.0
+
     def set_fan_speed(self, speed: float) -> None:
         """Set fan speed manually."""
         # Ensure speed is between min_speed and 100%
@@ -44,6 +44,9 @@ from src.bacnet_network import (  # noqa: E402
     get_vav_network_assignment,
 )
 
+# Office hours (8 AM to 6 PM) as a set of occupied hours of the day
+OCCUPIED_HOURS = frozenset(range(8, 18))
+
 
 def get_bacnet_address() -> str:
     """Get the BACnet address from environment variables.
@@ -107,8 +110,6 @@ async def run_simple_simulation():
     # 24-hour outdoor temperature pattern
     outdoor_temps = {hour: 65 + 15 * math.sin(math.pi * (hour - 5) / 12) for hour in range(24)}
 
-    # Office hours
-    occupied_hours = [(8, 18)]
     occupancy = 5
 
     current_hour = 6  # Start at 6 AM
@@ -119,8 +120,7 @@ async def run_simple_simulation():
             hour = current_hour % 24
             outdoor_temp = outdoor_temps[hour] + random.uniform(-1, 1)
 
-            is_occupied = any(start <= hour < end for start, end in occupied_hours)
-            occupancy_count = occupancy if is_occupied else 0
+            occupancy_count = occupancy if hour in OCCUPIED_HOURS else 0
 
             vav.set_occupancy(occupancy_count)
             vav.update(vav.zone_temp, supply_air_temp)
@@ -381,7 +381,6 @@ async def run_brick_simulation():
     # 24-hour outdoor temperature pattern
     outdoor_temps = {hour: 65 + 15 * math.sin(math.pi * (hour - 5) / 12) for hour in range(24)}
 
-    occupied_hours = [(8, 18)]
     occupancy = 5
     current_hour = 6
     supply_air_temp = 55
@@ -393,8 +392,7 @@ async def run_brick_simulation():
         while True:
             hour = current_hour % 24
             outdoor_temp = outdoor_temps[hour] + random.uniform(-1, 1)
-            is_occupied = any(start <= hour < end for start, end in occupied_hours)
-            occupancy_count = occupancy if is_occupied else 0
+            occupancy_count = occupancy if hour in OCCUPIED_HOURS else 0
 
             # Update all VAVs
             update_tasks = []
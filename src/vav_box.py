@@ -516,10 +516,6 @@ class VAVBox(BACPypesApplicationMixin):
         Returns:
             Temperature change in °F over the specified period
         """
-        # Constants for thermal calculations
-        AIR_DENSITY = 0.075  # lb/ft³
-        AIR_SPECIFIC_HEAT = 0.24  # BTU/lb·°F
-
         # Calculate heat gains/losses
 
         # 1. Heat transfer through building envelope
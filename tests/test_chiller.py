@@ -303,6 +303,26 @@ class TestChiller(unittest.TestCase):
         air_cooled_kw_per_ton = air_cooled_power / self.air_cooled_chiller.current_load
         self.assertGreater(air_cooled_kw_per_ton, water_cooled_kw_per_ton)
 
+    def test_set_idle(self):
+        """Test that an idle chiller reports no load and no power."""
+        self.water_cooled_chiller.connect_cooling_tower(self.cooling_tower)
+        self.water_cooled_chiller.update_load(
+            load=250,
+            entering_chilled_water_temp=54,
+            chilled_water_flow=1200,
+            ambient_wet_bulb=76,
+            ambient_dry_bulb=95,
+        )
+        self.assertGreater(self.water_cooled_chiller.calculate_power_consumption(), 0)
+
+        self.water_cooled_chiller.set_idle()
+
+        self.assertEqual(self.water_cooled_chiller.current_load, 0)
+        self.assertEqual(self.water_cooled_chiller.current_cop, 0)
+        self.assertEqual(self.water_cooled_chiller.chilled_water_flow, 0)
+        self.assertEqual(self.water_cooled_chiller.condenser_water_flow, 0)
+        self.assertEqual(self.water_cooled_chiller.calculate_power_consumption(), 0)
+
     def test_integrated_system_energy(self):
         """Test total system energy including cooling tower for water-cooled chiller."""
         # Connect cooling tower to water-cooled chiller
@@ -56,6 +56,31 @@ class TestCoolingTower(unittest.TestCase):
         # Verify that the fan speed is set appropriately for the load
         self.assertGreater(self.cooling_tower.fan_speed, 0)
 
+    def test_set_idle(self):
+        """Test that an idle cooling tower stops its fans and draws no power."""
+        self.cooling_tower.update_load(
+            load=500,
+            entering_water_temp=95,
+            ambient_wet_bulb=75,
+            condenser_water_flow=3000,
+        )
+        self.assertGreater(self.cooling_tower.fan_speed, 0)
+
+        self.assertGreater(self.cooling_tower.current_approach, 0)
+
+        self.cooling_tower.set_idle(ambient_wet_bulb=70)
+
+        self.assertEqual(self.cooling_tower.current_load, 0)
+        self.assertEqual(self.cooling_tower.water_flow, 0)
+        self.assertEqual(self.cooling_tower.fan_speed, 0)
+        self.assertEqual(self.cooling_tower.calculate_power_consumption(), 0)
+
+        # The idle tower reports ambient conditions, not its last loaded state
+        self.assertEqual(self.cooling_tower.current_wet_bulb, 70)
+        self.assertEqual(self.cooling_tower.current_approach, 0)
+        self.assertEqual(self.cooling_tower.calculate_approach(), 0)
+        self.assertEqual(self.cooling_tower.get_condenser_water_supply_temp(), 70)
+
     def test_calculate_approach(self):
         """Test calculation of approach temperature."""
         # Apply 75% load with 78°F wet bulb